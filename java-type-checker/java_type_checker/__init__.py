@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import sys
-if sys.version_info[0] < 3:
+if sys.version_info < (3, 7):
     print(
         """
-        This homework requires Python 3.
+        This homework requires Python 3.7 or newer.
         
         You may already have it in your path. Try using `python3` instead of `python`
         at the command line.
@@ -23,5 +23,76 @@ if sys.version_info[0] < 3:
         """)
     exit(1)
 
-from .types import *
-from .expressions import *
+import importlib
+
+# Each public name, and the submodule that defines it. Submodules are only imported the first time
+# one of their names is used, so `import java_type_checker` itself is nearly free, and a program
+# that only needs, say, the type model never pays for the checking service.
+
+_submodule_names = {
+    "types": [
+        "Type", "Declaration", "Constructor", "Method", "Field", "ClassOrInterface", "NullType",
+        "NoSuchMethod", "NoSuchField", "FrozenTypeError", "primitive_widenings",
+    ],
+    "scopes": [
+        "Scope", "NoSuchVariable",
+    ],
+    "expressions": [
+        "Expression", "Variable", "Literal", "NullLiteral", "MethodCall", "ConstructorCall",
+        "FieldAccess", "BinaryOperation", "Cast", "JavaTypeError", "type_errors", "names",
+        "lookup_by_class",
+        "resolve_method", "resolve_constructor", "resolve_field", "check_arguments",
+        "check_argument_count", "check_argument_types", "numeric_promotions", "boolean_operands",
+        "comparable_operands", "binary_operator_rules", "binary_result_type", "primitive_casts",
+        "is_castable", "cast_result_type",
+    ],
+    "statements": [
+        "Statement", "ExpressionStatement", "LocalDeclaration", "Block",
+    ],
+    "validation": [
+        "InvalidTypeModel", "builtin_types", "validate_types", "find_problems",
+    ],
+    "index": [
+        "TypeIndex",
+    ],
+    "caching": [
+        "CacheStats", "LRUCache", "CacheGroup",
+    ],
+    "universe": [
+        "TypeUniverse",
+    ],
+    "plans": [
+        "Hole", "CheckingPlan",
+    ],
+    "arena": [
+        "ExpressionArena",
+    ],
+    "loading": [
+        "load_universe", "load_expression", "split_template", "build_template",
+    ],
+    "service": [
+        "Diagnostic", "CheckResult", "check_batch", "CheckingService", "ServiceMetrics",
+    ],
+}
+
+_name_to_submodule = {
+    name: submodule
+    for submodule, public_names in _submodule_names.items()
+    for name in public_names
+}
+
+__all__ = list(_name_to_submodule)
+
+
+def __getattr__(name):
+    try:
+        submodule = _name_to_submodule[name]
+    except KeyError:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + submodule, __name__), name)
+    globals()[name] = value  # Later lookups skip this function entirely
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+
+from .types import Type
+from .scopes import Scope
+from .expressions import (
+    Variable, Literal, MethodCall, ConstructorCall, FieldAccess, BinaryOperation, Cast, type_errors,
+    lookup_by_class, resolve_method, resolve_constructor, resolve_field, check_argument_count,
+    check_argument_types, binary_result_type, cast_result_type)
+
+
+# Node kinds
+VARIABLE         = 0
+LITERAL          = 1
+METHOD_CALL      = 2
+CONSTRUCTOR_CALL = 3
+FIELD_ACCESS     = 4
+BINARY_OPERATION = 5
+CAST             = 6
+
+
+class ExpressionArena(object):
+    """
+        Many expressions stored compactly, as an alternative to a tree of Expression objects.
+
+        Each node is an index into parallel arrays of small integers: its kind, a type id, a name id,
+        and the position and number of its children in the shared `children` array. Types and
+        names (variable, method and field names, operators and literal values) are stored once
+        each and referred to by id. The builder methods mirror the Expression constructors, taking
+        and returning node indices:
+
+            arena = ExpressionArena()
+            point = arena.constructor_call(Graphics.point, arena.literal("0.0", Type.double), ...)
+            arena.method_call(point, "getX")
+
+        Since a node can only refer to nodes built before it, the nodes are always in post-order,
+        and check_all() checks every one of them in a single linear pass with no recursion.
+        """
+    def __init__(self):
+        self.kinds = array("b")        #: Kind of each node
+        self.type_ids = array("i")     #: Declared, literal, instantiated or cast-to type of each node, or -1
+        self.name_ids = array("i")     #: Name, operator or literal value of each node, or -1
+        self.first_child = array("i")  #: Where each node’s children start in `children`
+        self.child_count = array("i")  #: How many children each node has
+        self.children = array("i")     #: Child node indices, each node’s children together and in order
+        self.types = []                #: Types by id (list of Types)
+        self.names = []                #: Names by id (list of Strings)
+        self._type_ids = {}
+        self._name_ids = {}
+
+    # ––– Building –––
+
+    def variable(self, name, declared_type=None):
+        return self._add(VARIABLE, self._type_id(declared_type), self._name_id(name), ())
+
+    def literal(self, value, type):
+        return self._add(LITERAL, self._type_id(type), self._name_id(value), ())
+
+    def null_literal(self):
+        return self.literal("null", Type.null)
+
+    def method_call(self, receiver, method_name, *args):
+        return self._add(METHOD_CALL, -1, self._name_id(method_name), (receiver,) + args)
+
+    def constructor_call(self, instantiated_type, *args):
+        return self._add(CONSTRUCTOR_CALL, self._type_id(instantiated_type), -1, args)
+
+    def field_access(self, receiver, field_name):
+        return self._add(FIELD_ACCESS, -1, self._name_id(field_name), (receiver,))
+
+    def binary_operation(self, left, operator, right):
+        return self._add(BINARY_OPERATION, -1, self._name_id(operator), (left, right))
+
+    def cast(self, target_type, expression):
+        return self._add(CAST, self._type_id(target_type), -1, (expression,))
+
+    def add_expression(self, expression):
+        """ Copies an Expression tree into the arena, returning the index of its root node.
+            """
+        built = {}
+        pending = [(expression, False)]
+        while pending:
+            node, children_done = pending.pop()
+            children = node.children()
+            if children_done or not children:
+                built[id(node)] = self._copy(node, [built[id(child)] for child in children])
+            else:
+                pending.append((node, True))
+                pending.extend((child, False) for child in reversed(children))
+        return built[id(expression)]
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def _add(self, kind, type_id, name_id, children):
+        node = len(self.kinds)
+        for child in children:
+            if not 0 <= child < node:
+                raise ValueError("Node {0} does not exist in this arena".format(child))
+        self.kinds.append(kind)
+        self.type_ids.append(type_id)
+        self.name_ids.append(name_id)
+        self.first_child.append(len(self.children))
+        self.child_count.append(len(children))
+        self.children.extend(children)
+        return node
+
+    def _type_id(self, type):
+        if type is None:
+            return -1
+        try:
+            return self._type_ids[type]
+        except KeyError:
+            self._type_ids[type] = len(self.types)
+            self.types.append(type)
+            return self._type_ids[type]
+
+    def _name_id(self, name):
+        try:
+            return self._name_ids[name]
+        except KeyError:
+            self._name_ids[name] = len(self.names)
+            self.names.append(name)
+            return self._name_ids[name]
+
+    def _copy(self, node, children):
+        try:
+            copy = lookup_by_class(_copiers, node)
+        except KeyError:
+            raise ValueError("Cannot store {0} in an arena".format(type(node).__name__))
+        return copy(self, node, children)
+
+    # ––– Checking –––
+
+    def check_types(self, node, scope=Scope.empty):
+        """
+            Returns the static type of the given node, raising the same error that check_types()
+            would raise for the equivalent Expression. Only checks the nodes under this one.
+            """
+        verdict = self._check(self._subtree(node), scope, {}, self._columns(copy=False))[node]
+        if isinstance(verdict, tuple):
+            error_class, error_args = verdict
+            raise error_class(*error_args)
+        return verdict
+
+    def check_all(self, scope=Scope.empty):
+        """
+            Checks every node in the arena in one pass. Returns a list with, for each node, either
+            its static type or the error that check_types() would raise for it.
+            """
+        count = len(self.kinds)
+        verdicts = self._check(range(count), scope, [None] * count, self._columns(copy=True))
+        for node, verdict in enumerate(verdicts):
+            if type(verdict) is tuple:
+                error_class, error_args = verdict
+                verdicts[node] = error_class(*error_args)
+        return verdicts
+
+    def _subtree(self, root):
+        """ The nodes that root depends on, including itself, in the order they were built.
+            """
+        if not 0 <= root < len(self.kinds):
+            raise ValueError("Node {0} does not exist in this arena".format(root))
+        found = {root}
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            first = self.first_child[node]
+            for child in self.children[first:first + self.child_count[node]]:
+                if child not in found:
+                    found.add(child)
+                    pending.append(child)
+        return sorted(found)
+
+    def _columns(self, copy):
+        columns = (self.kinds, self.type_ids, self.name_ids, self.first_child, self.child_count, self.children)
+        if copy:
+            # Reading a list is faster than reading an array, which makes a new int object each
+            # time, so a pass over the whole arena copies the arrays in bulk first
+            columns = tuple(column.tolist() for column in columns)
+        return columns
+
+    def _check(self, nodes, scope, verdicts, columns):
+        """
+            Stores the verdict for each of the given nodes in verdicts: a Type, or (error class, args)
+            for an error. The nodes must come in the order they were built, so that every node’s
+            children already have their verdicts.
+
+            A node’s verdict depends only on its kind, its type and name ids, and its children’s
+            verdicts. Nodes that agree on all of those, which is common when checking many similar
+            expressions that differ in variable names and literal values, share one computed
+            verdict.
+            """
+        kinds, type_ids, name_ids, first_child, child_count, children = columns
+        types = self.types
+        known_verdicts = {}
+
+        for node in nodes:
+            count = child_count[node]
+            if count == 0:
+                kind = kinds[node]
+                type_id = type_ids[node]
+                if kind <= LITERAL and type_id >= 0:  # Literal or declared variable
+                    verdicts[node] = types[type_id]
+                    continue
+                key = (kind, type_id, name_ids[node])
+            elif count == 1:
+                key = (kinds[node], type_ids[node], name_ids[node], verdicts[children[first_child[node]]])
+            elif count == 2:
+                first = first_child[node]
+                key = (kinds[node], type_ids[node], name_ids[node],
+                       verdicts[children[first]], verdicts[children[first + 1]])
+            else:
+                first = first_child[node]
+                key = (kinds[node], type_ids[node], name_ids[node]) + tuple(
+                    [verdicts[child] for child in children[first:first + count]])
+            try:
+                verdicts[node] = known_verdicts[key]
+            except KeyError:
+                verdicts[node] = known_verdicts[key] = self._verdict(key, scope)
+        return verdicts
+
+    def _verdict(self, key, scope):
+        """ Applies the type rule for one node, given its kind, type id, name id and the verdicts of
+            its children. A node whose child failed gets the child’s verdict as is, unless
+            check_types() would have failed first on something else.
+            """
+        kind, type_id, name_id = key[:3]
+        child_verdicts = key[3:]
+        try:
+            if kind == VARIABLE:
+                return scope.lookup(self.names[name_id])
+
+            if kind == METHOD_CALL or kind == CONSTRUCTOR_CALL:
+                if kind == METHOD_CALL:
+                    receiver_type = child_verdicts[0]
+                    if isinstance(receiver_type, tuple):
+                        return receiver_type
+                    method_name = self.names[name_id]
+                    method = resolve_method(receiver_type, method_name)
+                    call_name = receiver_type.name + "." + method_name + "()"
+                    expected_types, result_type = method.argument_types, method.return_type
+                    argument_types = child_verdicts[1:]
+                else:
+                    result_type = self.types[type_id]
+                    call_name = result_type.name + " constructor"
+                    expected_types = resolve_constructor(result_type).argument_types
+                    argument_types = child_verdicts
+                check_argument_count(call_name, expected_types, len(argument_types))
+                for argument_type in argument_types:
+                    if isinstance(argument_type, tuple):
+                        return argument_type
+                check_argument_types(call_name, expected_types, argument_types)
+                return result_type
+
+            for child_verdict in child_verdicts:
+                if isinstance(child_verdict, tuple):
+                    return child_verdict
+            if kind == FIELD_ACCESS:
+                return resolve_field(child_verdicts[0], self.names[name_id]).type
+            if kind == BINARY_OPERATION:
+                return binary_result_type(self.names[name_id], *child_verdicts)
+            if kind == CAST:
+                return cast_result_type(child_verdicts[0], self.types[type_id])
+            raise ValueError("Unknown node kind {0}".format(kind))
+        except type_errors as error:
+            return (type(error), error.args)
+
+
+#: How add_expression() stores each kind of Expression, given the arena, the node and the indices
+#: of its already stored children
+_copiers = {
+    Variable:        lambda arena, node, children: arena.variable(node.name, node.declared_type),
+    Literal:         lambda arena, node, children: arena.literal(node.value, node.type),
+    MethodCall:      lambda arena, node, children: arena.method_call(children[0], node.method_name, *children[1:]),
+    ConstructorCall: lambda arena, node, children: arena.constructor_call(node.instantiated_type, *children),
+    FieldAccess:     lambda arena, node, children: arena.field_access(children[0], node.field_name),
+    BinaryOperation: lambda arena, node, children: arena.binary_operation(children[0], node.operator, children[1]),
+    Cast:            lambda arena, node, children: arena.cast(node.target_type, children[0]),
+}
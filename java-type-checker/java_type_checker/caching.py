@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict, namedtuple
+import threading
+
+
+#: A snapshot of one cache’s counters. Hits, misses and evictions count up from when the cache was
+#: created; clearing a cache empties it but keeps its history.
+CacheStats = namedtuple("CacheStats", ["size", "max_size", "hits", "misses", "evictions"])
+
+
+class LRUCache(object):
+    """
+        A dict-like cache that holds at most max_size entries. Storing a new entry in a full cache
+        evicts the entry that was least recently stored or looked up, so a long-running process
+        can cache freely without its memory growing with the number of distinct keys it has seen.
+
+        Any number of threads can share a cache.
+        """
+    def __init__(self, max_size=1024):
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1, not {0}".format(max_size))
+        self.max_size = max_size  #: The most entries the cache holds at once
+        self.hits = 0             #: Lookups that found an entry
+        self.misses = 0           #: Lookups that did not
+        self.evictions = 0        #: Entries dropped to make room for newer ones
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        """ Returns the entry for key, marking it as recently used, or raises KeyError.
+            """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        """ True if the cache has an entry for key. Does not count as a lookup.
+            """
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """ Drops every entry.
+            """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Returns the cache’s current size and counters (CacheStats).
+            """
+        with self._lock:
+            return CacheStats(len(self._entries), self.max_size, self.hits, self.misses, self.evictions)
+
+
+class CacheGroup(object):
+    """
+        Named LRUCaches that belong to the same thing and are cleared together: for example, every
+        cache of results computed from one TypeUniverse, which must all go when the universe does.
+        """
+    def __init__(self, default_max_size=1024):
+        self.default_max_size = default_max_size  #: Size limit for caches not given their own
+        self._caches = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cache(self, name, max_size=None):
+        """ Returns the group’s cache with the given name, creating it with the given size limit
+            (or the group’s default) the first time it is asked for. Raises ValueError if a size
+            limit is given that differs from the existing cache’s.
+            """
+        with self._lock:
+            try:
+                cache = self._caches[name]
+            except KeyError:
+                cache = LRUCache(max_size or self.default_max_size)
+                self._caches[name] = cache
+                return cache
+        if max_size is not None and max_size != cache.max_size:
+            raise ValueError("Cache {0} already exists with size limit {1}, not {2}".format(
+                name, cache.max_size, max_size))
+        return cache
+
+    def clear(self):
+        """ Drops every entry in every cache of the group.
+            """
+        for cache in list(self._caches.values()):
+            cache.clear()
+
+    def stats(self):
+        """ Returns a dict mapping each cache’s name to its CacheStats.
+            """
+        return {name: cache.stats() for name, cache in list(self._caches.items())}
+
+    def __iter__(self):
+        return iter(list(self._caches))
+
+    def __len__(self):
+        return len(self._caches)
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+"""
+Command-line batch checker:
+
+    python3 -m java_type_checker --universe types.json expressions.jsonl ...
+
+Loads a type universe and checks every expression in the given files, one JSON expression per line
+(see loading.py for both formats). Files are split into chunks that are checked in parallel across
+all cores. Diagnostics are printed as each chunk finishes, followed by a summary of throughput,
+cache hit rates and peak memory. Exits with status 1 if any expression had errors, or 2 without
+checking anything if the arguments or the universe are unusable.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+
+from .expressions import type_errors
+from .loading import load_universe, split_template, build_template
+from .plans import CheckingPlan
+from .validation import InvalidTypeModel
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def main(argv=None, out=sys.stdout, err=sys.stderr):
+    parser = argparse.ArgumentParser(
+        prog="python3 -m java_type_checker",
+        description="Type checks Java expressions against a type universe.")
+    parser.add_argument("--universe", required=True,
+        help="JSON file describing the classes and interfaces expressions may use")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+        help="number of worker processes (default: one per core; 1 checks in this process)")
+    parser.add_argument("--chunk-size", type=int, default=2000,
+        help="number of expressions each worker checks at a time (default: 2000)")
+    parser.add_argument("--max-templates", type=int, default=10000,
+        help="number of expression shapes each worker keeps checking plans for (default: 10000)")
+    parser.add_argument("--max-verdicts", type=int, default=100000,
+        help="number of verdicts each worker remembers across all its plans (default: 100000)")
+    parser.add_argument("files", nargs="+",
+        help="files containing one JSON expression per line")
+    args = parser.parse_args(argv)
+
+    # Find any problem with the arguments before starting workers, where it would be harder to report
+    try:
+        for option, value in [
+                ("--chunk-size", args.chunk_size),
+                ("--max-templates", args.max_templates),
+                ("--max-verdicts", args.max_verdicts)]:
+            if value < 1:
+                raise ValueError("{0} must be at least 1, not {1}".format(option, value))
+        for path in args.files:
+            if not os.path.isfile(path):
+                raise ValueError("Cannot read {0}: no such file".format(path))
+        universe_data = _read_universe(args.universe)
+    except (OSError, ValueError, KeyError, TypeError, InvalidTypeModel) as error:
+        print("{0}: error: {1}".format(parser.prog, str(error).replace("\n", "; ")), file=err)
+        return 2
+
+    start = time.perf_counter()
+    chunks = _read_chunks(args.files, args.chunk_size)
+    totals = CheckerStats()
+
+    if args.jobs <= 1:
+        _start_worker(universe_data, args.max_templates, args.max_verdicts)
+        for chunk in chunks:
+            _report(_check_chunk(*chunk), totals, out)
+    else:
+        # Read and submit chunks as workers free up, so that memory stays bounded however large
+        # the input is, and diagnostics appear as soon as they are found
+        max_in_flight = 2 * args.jobs
+        with ProcessPoolExecutor(
+                args.jobs,
+                initializer=_start_worker,
+                initargs=(universe_data, args.max_templates, args.max_verdicts)) as pool:
+            in_flight = set()
+            for chunk in chunks:
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _report(future.result(), totals, out)
+                in_flight.add(pool.submit(_check_chunk, *chunk))
+            for future in as_completed(in_flight):
+                _report(future.result(), totals, out)
+
+    _print_summary(totals, len(args.files), time.perf_counter() - start, out)
+    return 1 if totals.errors else 0
+
+
+def _read_universe(path):
+    """ Reads a universe file, returning its JSON data once it has loaded and validated cleanly.
+        """
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    load_universe(data).freeze()
+    return data
+
+
+def _read_chunks(paths, chunk_size):
+    """ Yields (path, first line number, lines) for consecutive groups of lines in each file,
+        reading each group only when it is asked for.
+        """
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            first = 1
+            while True:
+                lines = list(islice(file, chunk_size))
+                if not lines:
+                    break
+                yield path, first, lines
+                first += len(lines)
+
+
+# ––– Workers –––
+
+_universe = None
+_plans = None
+
+
+def _start_worker(universe_data, max_templates, max_verdicts):
+    global _universe, _plans
+    _universe = load_universe(universe_data)
+    _universe.freeze()
+    _plans = _universe.caches.cache("plans", max_templates)
+    _universe.caches.cache("verdicts", max_verdicts)  # Shared by every plan, see CheckingPlan
+
+
+def _check_chunk(path, first_line, lines):
+    """ Checks one chunk of an expression file, returning the diagnostics found as a list of
+        (path, line number, kind, message), and the worker’s statistics.
+
+        Expressions that differ only in variable names and literal values share a CheckingPlan, so
+        each distinct expression shape is only really checked once per combination of leaf types.
+        Plans for the least recently seen shapes are evicted once there are too many.
+        """
+    stats = CheckerStats()
+    diagnostics = []
+    evictions_before = _plans.evictions
+    for line_number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        stats.expressions += 1
+        try:
+            key, hole_types = split_template(json.loads(line), _universe)
+            try:
+                plan, hole_order = _plans[key]
+                stats.template_hits += 1
+            except KeyError:
+                stats.template_misses += 1
+                plan = CheckingPlan(build_template(key, hole_types), caches=_universe.caches)
+                hole_order = [int(hole.name[1:]) for hole in plan.holes]  # Holes are named h0, h1, …
+                _plans[key] = plan, hole_order
+            hits_before = plan.hits
+            try:
+                plan.check_hole_types([hole_types[i] for i in hole_order])
+            finally:
+                stats.verdict_hits += plan.hits - hits_before
+        except type_errors as error:
+            diagnostics.append((path, line_number, type(error).__name__, str(error)))
+        except (ValueError, KeyError, TypeError) as error:  # Malformed JSON or expression
+            diagnostics.append((path, line_number, "InvalidInput", str(error)))
+        except RecursionError:  # From parsing, splitting or compiling a very deeply nested line
+            diagnostics.append((path, line_number, "InvalidInput", "Expression is nested too deeply"))
+    stats.errors = len(diagnostics)
+    stats.template_evictions = _plans.evictions - evictions_before
+    stats.peak_memory = _peak_memory()
+    return diagnostics, stats
+
+
+# ––– Reporting –––
+
+class CheckerStats(object):
+    """ Counts kept by each worker and totalled up for the summary.
+        """
+    def __init__(self):
+        self.expressions = 0
+        self.errors = 0
+        self.template_hits = 0
+        self.template_misses = 0
+        self.template_evictions = 0
+        self.verdict_hits = 0
+        self.peak_memory = None  #: Peak resident memory in bytes, if known
+
+    def add(self, other):
+        self.expressions += other.expressions
+        self.errors += other.errors
+        self.template_hits += other.template_hits
+        self.template_misses += other.template_misses
+        self.template_evictions += other.template_evictions
+        self.verdict_hits += other.verdict_hits
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+
+
+def _report(result, totals, out):
+    diagnostics, stats = result
+    for path, line_number, kind, message in diagnostics:
+        print("{0}:{1}: {2}: {3}".format(path, line_number, kind, message), file=out)
+    out.flush()
+    totals.add(stats)
+
+
+def _print_summary(totals, file_count, elapsed, out):
+    print("Checked {0} expressions in {1} files: {2} with errors".format(
+        totals.expressions, file_count, totals.errors), file=out)
+    print("Time: {0:.3f} s ({1:.0f} expressions/sec)".format(
+        elapsed, totals.expressions / elapsed if elapsed else 0), file=out)
+    print("Template cache: {0} hit rate ({1} plans built for {2} expressions, {3} evicted)".format(
+        _percent(totals.template_hits, totals.template_hits + totals.template_misses),
+        totals.template_misses,
+        totals.expressions,
+        totals.template_evictions), file=out)
+    print("Verdict cache: {0} hit rate".format(
+        _percent(totals.verdict_hits, totals.expressions)), file=out)
+    peak = max(totals.peak_memory or 0, _peak_memory() or 0)
+    print("Peak memory: {0}".format(
+        "{0:.1f} MB (largest process)".format(peak / 2**20) if peak else "unknown"), file=out)
+
+
+def _percent(part, whole):
+    return "{0:.1f}%".format(100.0 * part / whole) if whole else "n/a"
+
+
+def _peak_memory():
+    """ This process’s peak resident memory in bytes, or None if the platform cannot tell us.
+        """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # macOS reports bytes, Linux KiB
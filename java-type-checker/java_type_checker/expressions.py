@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from .types import Type
+from .types import Type, NoSuchMethod, NoSuchField
+from .scopes import Scope, NoSuchVariable
 
 
 class Expression(object):
@@ -9,39 +10,53 @@ class Expression(object):
         this class does not actually _evaluate_ expressions.
         """
 
-    def static_type(self):
+    def static_type(self, scope=Scope.empty):
         """
             Returns the compile-time type of this expression, i.e. the most specific type that describes
-            all the possible values it could take on at runtime. Subclasses must implement this method.
+            all the possible values it could take on at runtime. Variables without a declared type
+            are looked up in the given Scope. Subclasses must implement this method.
             """
         pass
 
-    def check_types(self):
+    def check_types(self, scope=Scope.empty):
         """
             Validates the structure of this expression, checking for any logical inconsistencies in the
-            child nodes and the operation this expression applies to them.
+            child nodes and the operation this expression applies to them. Returns the static type.
+            Variables without a declared type are looked up in the given Scope.
             """
         pass
 
+    def children(self):
+        """
+            Returns the direct subexpressions of this expression, in the order check_types() checks
+            them. Subclasses with subexpressions must override this method.
+            """
+        return ()
+
 
 class Variable(Expression):
     """ An expression that reads the value of a variable, e.g. `x` in the expression `x + 5`.
+        If no declared type is given, static_type() and check_types() find it in the enclosing Scope.
         """
-    def __init__(self, name, declared_type):
+    def __init__(self, name, declared_type=None):
         self.name = name                    #: The name of the variable
-        self.declared_type = declared_type  #: The declared type of the variable (Type)
+        self.declared_type = declared_type  #: The declared type of the variable (Type or None)
 
-    def static_type(self):
+    def static_type(self, scope=Scope.empty):
         """
         Returns the compile-time type of this expression, i.e. the most specific type that describes
         all the possible values it could take on at runtime.
         """
+        if self.declared_type is None:
+            return scope.lookup(self.name)
         return self.declared_type
-    def check_types(self):
+    def check_types(self, scope=Scope.empty):
         """
         Validates the structure of this expression, checking for any logical inconsistencies in the
         child nodes and the operation this expression applies to them.
         """
+        if self.declared_type is None:
+            return scope.lookup(self.name)
         return self.declared_type
 
 
@@ -52,13 +67,13 @@ class Literal(Expression):
         self.value = value  #: The literal value, as a string
         self.type = type    #: The type of the literal (Type)
 
-    def static_type(self):
+    def static_type(self, scope=Scope.empty):
         """
         Returns the compile-time type of this expression, i.e. the most specific type that describes
         all the possible values it could take on at runtime.
         """
         return self.type
-    def check_types(self):
+    def check_types(self, scope=Scope.empty):
         """
         Validates the structure of this expression, checking for any logical inconsistencies in the
         child nodes and the operation this expression applies to them.
@@ -69,7 +84,7 @@ class NullLiteral(Literal):
     def __init__(self):
         super().__init__("null", Type.null)
 
-    def static_type(self):
+    def static_type(self, scope=Scope.empty):
         """
         Returns the compile-time type of this expression, i.e. the most specific type that describes
         all the possible values it could take on at runtime.
@@ -85,57 +100,30 @@ class MethodCall(Expression):
         self.method_name = method_name  #: The name of the method to call (String)
         self.args = args                #: The method arguments (list of Expressions)
 
-    def static_type(self):
+    def static_type(self, scope=Scope.empty):
         """
         Returns the compile-time type of this expression, i.e. the most specific type that describes
         all the possible values it could take on at runtime.
         """
 
-        return self.receiver.static_type().method_named(self.method_name).return_type
+        return self.receiver.static_type(scope).method_named(self.method_name).return_type
 
-    def check_types(self):
+    def check_types(self, scope=Scope.empty):
         """
         Validates the structure of this expression, checking for any logical inconsistencies in the
         child nodes and the operation this expression applies to them.
         """
-        # Check if primitive
-        if self.receiver.static_type() is (Type.int or Type.boolean or Type.double or Type.void):
-            raise JavaTypeError(
-                 "Type {0} does not have methods".format(
-                     self.receiver.static_type().name))
-
-        # Check if method exists
-        if not self.receiver.static_type().method_named(self.method_name):
-            raise JavaTypeError("{0} has no method named {1}".format(
-                self.receiver.static_type().name,
-                self.method_name
-            ))
-
-        # Check length of arguments
-        if len(self.receiver.static_type().method_named(self.method_name).argument_types) != len(self.args):
-            raise JavaTypeError(
-                "Wrong number of arguments for {0}: expected {1}, got {2}".format(
-                    self.receiver.static_type().name + '.' + self.method_name + "()",
-                    len(self.receiver.static_type().method_named(self.method_name).argument_types),
-                    len(self.args)))
-
-        # Check deep expressions...
-        passedArguments = []
-        for argument in self.args:
-            passedArguments.append(argument.static_type())
-        for i in range(0, len(self.args)):
-            self.args[i].check_types()
-            if passedArguments[i] == self.receiver.static_type().method_named(self.method_name).argument_types[i]:
-                pass
-            elif self.receiver.static_type().method_named(self.method_name).argument_types[i] in \
-                    passedArguments[i].direct_supertypes or passedArguments[i] == Type.null:
-                pass
-            else:
-                raise JavaTypeError("{0} expects arguments of type {1}, but got {2}".format(
-                    self.receiver.static_type().name + "." +
-                    self.receiver.static_type().method_named(self.method_name).name + "()",
-                    names(self.receiver.static_type().method_named(self.method_name).argument_types),
-                    names(passedArguments)))
+        receiver_type = self.receiver.check_types(scope)
+        method = resolve_method(receiver_type, self.method_name)
+        check_arguments(
+            receiver_type.name + "." + self.method_name + "()",
+            method.argument_types,
+            self.args,
+            scope)
+        return method.return_type
+
+    def children(self):
+        return (self.receiver,) + tuple(self.args)
 
 
 class ConstructorCall(Expression):
@@ -147,55 +135,108 @@ class ConstructorCall(Expression):
         self.args = args                            #: Constructor arguments (list of Expressions)
 
 
-    def static_type(self):
+    def static_type(self, scope=Scope.empty):
         """
         Returns the compile-time type of this expression, i.e. the most specific type that describes
         all the possible values it could take on at runtime.
         """
         return self.instantiated_type
-    def check_types(self):
+    def check_types(self, scope=Scope.empty):
         """
         Validates the structure of this expression, checking for any logical inconsistencies in the
         child nodes and the operation this expression applies to them.
         """
-        # Check if primitive
-        if self.instantiated_type is (Type.int or Type.boolean or Type.double or Type.void):
-            raise JavaTypeError(
-                "Type {0} is not instantiable".format(
-                    self.instantiated_type.name))
+        constructor = resolve_constructor(self.instantiated_type)
+        check_arguments(
+            self.instantiated_type.name + " constructor",
+            constructor.argument_types,
+            self.args,
+            scope)
+        return self.instantiated_type
 
-        # Check if null
-        if self.instantiated_type == Type.null:
-            raise JavaTypeError("Type null is not instantiable")
+    def children(self):
+        return tuple(self.args)
+
+
+class FieldAccess(Expression):
+    """
+        A Java field read, i.e. `foo.bar`.
+        """
+    def __init__(self, receiver, field_name):
+        self.receiver = receiver        #: The object whose field we are reading (Expression)
+        self.field_name = field_name    #: The name of the field to read (String)
+
+    def static_type(self, scope=Scope.empty):
+        """
+        Returns the compile-time type of this expression, i.e. the most specific type that describes
+        all the possible values it could take on at runtime.
+        """
+        return self.receiver.static_type(scope).field_named(self.field_name).type
+
+    def check_types(self, scope=Scope.empty):
+        """
+        Validates the structure of this expression, checking for any logical inconsistencies in the
+        child nodes and the operation this expression applies to them.
+        """
+        return resolve_field(self.receiver.check_types(scope), self.field_name).type
+
+    def children(self):
+        return (self.receiver,)
+
+
+class BinaryOperation(Expression):
+    """
+        A Java infix operator applied to two operands, i.e. `x + 5` or `a < b`. The result type
+        of each operator comes from `binary_operator_rules`.
+        """
+    def __init__(self, left, operator, right):
+        self.left = left            #: The left operand (Expression)
+        self.operator = operator    #: The operator, as written in Java, e.g. "+" (String)
+        self.right = right          #: The right operand (Expression)
+
+    def static_type(self, scope=Scope.empty):
+        """
+        Returns the compile-time type of this expression, i.e. the most specific type that describes
+        all the possible values it could take on at runtime.
+        """
+        return binary_result_type(self.operator, self.left.static_type(scope), self.right.static_type(scope))
+
+    def check_types(self, scope=Scope.empty):
+        """
+        Validates the structure of this expression, checking for any logical inconsistencies in the
+        child nodes and the operation this expression applies to them.
+        """
+        return binary_result_type(self.operator, self.left.check_types(scope), self.right.check_types(scope))
+
+    def children(self):
+        return (self.left, self.right)
+
+
+class Cast(Expression):
+    """
+        A Java type cast, i.e. `(Foo) bar`.
+        """
+    def __init__(self, target_type, expression):
+        self.target_type = target_type  #: The type to cast to (Type)
+        self.expression = expression    #: The value being cast (Expression)
+
+    def static_type(self, scope=Scope.empty):
+        """
+        Returns the compile-time type of this expression, i.e. the most specific type that describes
+        all the possible values it could take on at runtime.
+        """
+        return self.target_type
+
+    def check_types(self, scope=Scope.empty):
+        """
+        Validates the structure of this expression, checking for any logical inconsistencies in the
+        child nodes and the operation this expression applies to them.
+        """
+        return cast_result_type(self.expression.check_types(scope), self.target_type)
+
+    def children(self):
+        return (self.expression,)
 
-        # Check length of arguments
-        if len(self.instantiated_type.constructor.argument_types) != len(self.args):
-            raise JavaTypeError(
-                "Wrong number of arguments for {0}: expected {1}, got {2}".format(
-                    self.instantiated_type.name + " constructor",
-                    len(self.instantiated_type.constructor.argument_types),
-                    len(self.args)))
-
-        # Check for deep expressions...
-        passedArguments = []
-        expectedArguments = self.instantiated_type.constructor.argument_types
-
-        for argument in self.args:
-            passedArguments.append(argument.static_type())
-        for i in range(0, len(self.args)):
-            self.args[i].check_types()
-            if passedArguments[i] == expectedArguments[i]:
-                pass
-            elif expectedArguments[i] in passedArguments[i].direct_supertypes:
-                pass
-            elif passedArguments[i] == Type.null and expectedArguments[i] is not (Type.int or Type.boolean or Type.double
-                                                                               or Type.void):
-                pass
-            else:
-                raise JavaTypeError("{0} expects arguments of type {1}, but got {2}".format(
-                                self.instantiated_type.name + " constructor",
-                                names(expectedArguments),
-                                names(passedArguments)))
 
 class JavaTypeError(Exception):
     """ Indicates a compile-time type error in an expression.
@@ -203,7 +244,184 @@ class JavaTypeError(Exception):
     pass
 
 
+#: Every exception check_types() raises to report a problem in the code it is checking, as
+#: opposed to a bug in the checker itself.
+type_errors = (JavaTypeError, NoSuchMethod, NoSuchField, NoSuchVariable)
+
+
 def names(named_things):
     """ Helper for formatting pretty error messages
         """
     return "(" + ", ".join([e.name for e in named_things]) + ")"
+
+
+def lookup_by_class(table, node):
+    """ Returns the entry of a table keyed by Expression class that applies to the given node: the
+        entry for its own class, or else for its nearest base class that has one. Raises KeyError
+        if there is none. Lets other checkers dispatch on node kinds with one dict lookup each.
+        """
+    node_class = type(node)
+    try:
+        return table[node_class]
+    except KeyError:
+        for base in node_class.__mro__[1:]:
+            if base in table:
+                table[node_class] = table[base]  # Found directly next time
+                return table[base]
+        raise
+
+
+# Type rules for each kind of expression, in terms of the types of its children. The Expression
+# classes above apply these to whole trees; other checkers can apply them to types directly.
+
+def resolve_method(receiver_type, method_name):
+    """ Returns the Method that a call with the given receiver type and method name invokes.
+        """
+    if receiver_type.is_primitive:
+        raise JavaTypeError(
+             "Type {0} does not have methods".format(
+                 receiver_type.name))
+    return receiver_type.method_named(method_name)
+
+
+def resolve_constructor(instantiated_type):
+    """ Returns the Constructor that `new` invokes for the given type.
+        """
+    if not instantiated_type.is_instantiable:
+        raise JavaTypeError(
+            "Type {0} is not instantiable".format(
+                instantiated_type.name))
+    return instantiated_type.constructor
+
+
+def resolve_field(receiver_type, field_name):
+    """ Returns the Field that an access with the given receiver type and field name reads.
+        """
+    if receiver_type.is_primitive:
+        raise JavaTypeError(
+            "Type {0} does not have fields".format(
+                receiver_type.name))
+    return receiver_type.field_named(field_name)
+
+
+def check_arguments(call_name, expected_types, args, scope=Scope.empty):
+    """ Checks the argument expressions of a method or constructor call against the declared
+        argument types, raising a JavaTypeError that names the call if they do not match.
+        """
+    check_argument_count(call_name, expected_types, len(args))
+    check_argument_types(call_name, expected_types, [argument.check_types(scope) for argument in args])
+
+
+def check_argument_count(call_name, expected_types, argument_count):
+    if len(expected_types) != argument_count:
+        raise JavaTypeError(
+            "Wrong number of arguments for {0}: expected {1}, got {2}".format(
+                call_name,
+                len(expected_types),
+                argument_count))
+
+
+def check_argument_types(call_name, expected_types, actual_types):
+    for actual_type, expected_type in zip(actual_types, expected_types):
+        if not actual_type.is_assignable_to(expected_type):
+            raise JavaTypeError(
+                "{0} expects arguments of type {1}, but got {2}".format(
+                    call_name,
+                    names(expected_types),
+                    names(actual_types)))
+
+
+# Type rules for operators and casts. Each rule is a table lookup keyed by operand types, so
+# supporting a new operator means adding an entry here rather than another branch in a checker.
+
+numeric_promotions = {
+    (Type.int,    Type.int):    Type.int,
+    (Type.int,    Type.double): Type.double,
+    (Type.double, Type.int):    Type.double,
+    (Type.double, Type.double): Type.double,
+}
+
+boolean_operands = {
+    (Type.boolean, Type.boolean): Type.boolean,
+}
+
+comparable_operands = {operands: Type.boolean for operands in numeric_promotions}
+
+
+def _reference_equality(operands):
+    left, right = operands
+    if left.is_primitive or right.is_primitive:
+        return None
+    if left.is_subtype_of(right) or right.is_subtype_of(left):
+        return Type.boolean
+    return None
+
+
+def _equality(operands):
+    return (comparable_operands.get(operands)
+            or boolean_operands.get(operands)
+            or _reference_equality(operands))
+
+
+binary_operator_rules = {
+    "+":  numeric_promotions.get,
+    "-":  numeric_promotions.get,
+    "*":  numeric_promotions.get,
+    "/":  numeric_promotions.get,
+    "%":  numeric_promotions.get,
+    "<":  comparable_operands.get,
+    "<=": comparable_operands.get,
+    ">":  comparable_operands.get,
+    ">=": comparable_operands.get,
+    "&&": boolean_operands.get,
+    "||": boolean_operands.get,
+    "==": _equality,
+    "!=": _equality,
+}
+
+
+def binary_result_type(operator, left_type, right_type):
+    """ Returns the type of applying a binary operator to operands of the given types, raising a
+        JavaTypeError if the operator does not apply to them.
+        """
+    try:
+        rule = binary_operator_rules[operator]
+    except KeyError:
+        raise JavaTypeError("Unknown operator {0}".format(operator))
+    result_type = rule((left_type, right_type))
+    if result_type is None:
+        raise JavaTypeError(
+            "Operator {0} cannot be applied to {1}".format(
+                operator,
+                names([left_type, right_type])))
+    return result_type
+
+
+primitive_casts = {
+    (Type.int,     Type.int),
+    (Type.int,     Type.double),
+    (Type.double,  Type.int),
+    (Type.double,  Type.double),
+    (Type.boolean, Type.boolean),
+}
+
+
+def is_castable(source_type, target_type):
+    """ True if Java allows an explicit cast from the source type to the target type: between
+        numeric primitives, or up or down a reference type hierarchy.
+        """
+    if source_type.is_primitive or target_type.is_primitive:
+        return (source_type, target_type) in primitive_casts
+    return source_type.is_subtype_of(target_type) or target_type.is_subtype_of(source_type)
+
+
+def cast_result_type(source_type, target_type):
+    """ Returns the type of casting a value of the source type to the target type, raising a
+        JavaTypeError if Java does not allow that cast.
+        """
+    if not is_castable(source_type, target_type):
+        raise JavaTypeError(
+            "Cannot cast {0} to {1}".format(
+                source_type.name,
+                target_type.name))
+    return target_type
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from .types import ClassOrInterface
+
+
+class TypeIndex(object):
+    """
+        Answers reverse questions about a set of types, such as “which types can be passed where a
+        Paint is expected?” or “which types declare getX()?”, without scanning every type.
+
+        The index is updated incrementally as each type is added, at a cost proportional to that
+        type’s ancestors and declared methods; every query is then a single dict lookup. It
+        reflects each type as it was when added, so add types once they are complete.
+        """
+    def __init__(self, types=()):
+        self._subtypes = {}
+        self._declaring_types = {}
+        self._methods_by_signature = {}
+        for type in types:
+            self.add(type)
+
+    def add(self, type):
+        """ Adds a type to the index.
+            """
+        for ancestor in _ancestors(type):
+            self._subtypes.setdefault(ancestor, set()).add(type)
+
+        if isinstance(type, ClassOrInterface):
+            for method in type.methods.values():
+                self._declaring_types.setdefault(method.name, set()).add(type)
+                signature = (tuple(method.argument_types), method.return_type)
+                self._methods_by_signature.setdefault(signature, []).append((type, method))
+
+    def subtypes_of(self, type):
+        """ Returns the set of indexed types that are subtypes of the given type, including the type
+            itself if it is indexed: i.e. the types of all the values that a variable of the given
+            type accepts. The result belongs to the index; do not modify it.
+            """
+        return self._subtypes.get(type, _EMPTY)
+
+    def types_declaring(self, method_name):
+        """ Returns the set of indexed types that declare a method with the given name themselves,
+            as opposed to inheriting it. The result belongs to the index; do not modify it.
+            """
+        return self._declaring_types.get(method_name, _EMPTY)
+
+    def methods_with_signature(self, argument_types, return_type):
+        """ Returns a list of (declaring type, Method) pairs for every indexed method that takes
+            exactly the given argument types and returns the given type.
+            """
+        return list(self._methods_by_signature.get((tuple(argument_types), return_type), ()))
+
+
+_EMPTY = frozenset()
+
+
+def _ancestors(type):
+    """ Returns the type and all of its direct and indirect supertypes.
+        """
+    found = {type}
+    pending = [type]
+    while pending:
+        for supertype in pending.pop().direct_supertypes:
+            if supertype not in found:
+                found.add(supertype)
+                pending.append(supertype)
+    return found
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+Reads type universes and expressions from JSON, for tools such as the command-line checker.
+
+A type universe is a JSON object listing classes and interfaces. Names refer to the built-in types
+(`void`, `boolean`, `int`, `double`, `null`, `Object`) or to other types in the same file, in any
+order:
+
+    {"types": [
+        {"name": "Point",
+         "supertypes": ["Object"],
+         "constructor": ["double", "double"],
+         "methods": [{"name": "getX", "arguments": [], "returns": "double"}],
+         "fields": [{"name": "x", "type": "double"}]}
+    ]}
+
+Each expression is a JSON object with one of these shapes:
+
+    {"variable": "p", "type": "Point"}
+    {"literal": "0.0", "type": "double"}
+    {"null": true}
+    {"call": "getX", "receiver": «expression», "args": [«expression», ...]}
+    {"new": "Point", "args": [«expression», ...]}
+    {"field": "x", "receiver": «expression»}
+    {"operator": "+", "left": «expression», "right": «expression»}
+    {"cast": "int", "expression": «expression»}
+"""
+
+import json
+
+from .types import ClassOrInterface, Constructor, Method, Field
+from .expressions import (
+    Variable, Literal, NullLiteral, MethodCall, ConstructorCall, FieldAccess, BinaryOperation, Cast)
+from .plans import Hole
+from .universe import TypeUniverse
+
+
+def load_universe(data):
+    """ Builds an unfrozen TypeUniverse from its parsed JSON description. Raises ValueError if the
+        description is not shaped as documented above.
+        """
+    declarations = _object(data, "Type universe").get("types", [])
+    if not isinstance(declarations, list):
+        raise ValueError("Type universe types must be a JSON array, not {0}".format(_describe(declarations)))
+    for declaration in declarations:
+        _object(declaration, "Type declaration")
+    types = TypeUniverse()
+    declared = [ClassOrInterface(declaration["name"]) for declaration in declarations]
+    types_by_name = {type.name: type for type in list(types) + declared}
+
+    def lookup(name):
+        try:
+            return types_by_name[name]
+        except KeyError:
+            raise ValueError("Unknown type {0}".format(name))
+
+    for type, declaration in zip(declared, declarations):
+        type.direct_supertypes = [lookup(name) for name in declaration.get("supertypes", ["Object"])]
+        type.constructor = Constructor([lookup(name) for name in declaration.get("constructor", [])])
+        type.methods = {
+            method["name"]: Method(
+                method["name"],
+                argument_types=[lookup(name) for name in method.get("arguments", [])],
+                return_type=lookup(method.get("returns", "void")))
+            for method in _objects(declaration.get("methods", []), "Method declaration")}
+        type.fields = {
+            field["name"]: Field(field["name"], lookup(field["type"]))
+            for field in _objects(declaration.get("fields", []), "Field declaration")}
+    return TypeUniverse(declared)
+
+
+def load_expression(data, universe):
+    """ Builds an Expression from its parsed JSON description.
+        """
+    def lookup(name):
+        try:
+            return universe[name]
+        except KeyError:
+            raise ValueError("Unknown type {0}".format(name))
+
+    def build(node):
+        _object(node, "Expression")
+        if "variable" in node:
+            return Variable(node["variable"], lookup(node["type"]) if "type" in node else None)
+        if "literal" in node:
+            return Literal(node["literal"], lookup(node["type"]))
+        if "null" in node:
+            return NullLiteral()
+        if "call" in node:
+            return MethodCall(build(node["receiver"]), node["call"], *[build(arg) for arg in node.get("args", [])])
+        if "new" in node:
+            return ConstructorCall(lookup(node["new"]), *[build(arg) for arg in node.get("args", [])])
+        if "field" in node:
+            return FieldAccess(build(node["receiver"]), node["field"])
+        if "operator" in node:
+            return BinaryOperation(build(node["left"]), node["operator"], build(node["right"]))
+        if "cast" in node:
+            return Cast(lookup(node["cast"]), build(node["expression"]))
+        raise ValueError("Unrecognized expression {0}".format(node))
+
+    return build(data)
+
+
+def split_template(data, universe):
+    """
+        Splits the parsed JSON description of an expression into its template and the types of
+        its leaves. The template key ignores variable names and literal values, so expressions that
+        differ only in those share a key, and can share one CheckingPlan built by
+        build_template(). Returns (key, leaf types).
+        """
+    hole_types = []
+
+    def lookup(name):
+        try:
+            return universe[name]
+        except KeyError:
+            raise ValueError("Unknown type {0}".format(name))
+
+    def split(node):
+        _object(node, "Expression")
+        if "variable" in node or "literal" in node:
+            if "type" not in node:
+                raise ValueError("Expression leaf has no type: {0}".format(node))
+            hole_types.append(lookup(node["type"]))
+            return None
+        if "null" in node:
+            hole_types.append(universe["null"])
+            return None
+        if "call" in node:
+            return ("call", node["call"], split(node["receiver"])) + tuple(split(arg) for arg in node.get("args", []))
+        if "new" in node:
+            return ("new", lookup(node["new"])) + tuple(split(arg) for arg in node.get("args", []))
+        if "field" in node:
+            return ("field", node["field"], split(node["receiver"]))
+        if "operator" in node:
+            return ("operator", node["operator"], split(node["left"]), split(node["right"]))
+        if "cast" in node:
+            return ("cast", lookup(node["cast"]), split(node["expression"]))
+        raise ValueError("Unrecognized expression {0}".format(node))
+
+    return split(data), hole_types
+
+
+def build_template(key, hole_types):
+    """ Builds the template Expression for a key from split_template(), with a Hole for each leaf,
+        in the same order as the hole types.
+        """
+    remaining = iter(enumerate(hole_types))
+
+    def build(key):
+        if key is None:
+            index, hole_type = next(remaining)
+            return Hole("h" + str(index), hole_type)
+        kind = key[0]
+        if kind == "call":
+            receiver = build(key[2])
+            return MethodCall(receiver, key[1], *[build(arg) for arg in key[3:]])
+        if kind == "new":
+            return ConstructorCall(key[1], *[build(arg) for arg in key[2:]])
+        if kind == "field":
+            return FieldAccess(build(key[2]), key[1])
+        if kind == "operator":
+            left = build(key[2])
+            return BinaryOperation(left, key[1], build(key[3]))
+        return Cast(key[1], build(key[2]))
+
+    return build(key)
+
+
+def _object(value, what):
+    """ Returns value if it is a parsed JSON object, else raises ValueError naming what it was
+        supposed to be.
+        """
+    if not isinstance(value, dict):
+        raise ValueError("{0} must be a JSON object, not {1}".format(what, _describe(value)))
+    return value
+
+
+def _objects(values, what):
+    if not isinstance(values, list):
+        raise ValueError("{0}s must be in a JSON array, not {1}".format(what, _describe(values)))
+    return [_object(value, what) for value in values]
+
+
+def _describe(value):
+    """ Short JSON text of a value, for error messages.
+        """
+    text = json.dumps(value)
+    return text if len(text) <= 40 else text[:37] + "..."
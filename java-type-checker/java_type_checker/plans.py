@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+
+from .scopes import Scope
+from .caching import LRUCache
+from .expressions import (
+    Expression, MethodCall, ConstructorCall, FieldAccess, BinaryOperation, Cast, type_errors,
+    lookup_by_class, resolve_method, resolve_constructor, resolve_field, check_argument_count,
+    check_argument_types, binary_result_type, cast_result_type)
+
+
+class Hole(Expression):
+    """
+        A placeholder in an expression template for a leaf that changes from one instance of the
+        template to the next, e.g. a variable name or literal value. On its own, a hole checks
+        as a value of its declared type.
+        """
+    def __init__(self, name, type):
+        self.name = name  #: Identifies the hole when filling it in (String)
+        self.type = type  #: The type of the hole when it is not given another one (Type)
+
+    def static_type(self, scope=Scope.empty):
+        """
+        Returns the compile-time type of this expression, i.e. the most specific type that describes
+        all the possible values it could take on at runtime.
+        """
+        return self.type
+
+    def check_types(self, scope=Scope.empty):
+        """
+        Validates the structure of this expression, checking for any logical inconsistencies in the
+        child nodes and the operation this expression applies to them.
+        """
+        return self.type
+
+
+_plan_ids = itertools.count()
+
+
+class CheckingPlan(object):
+    """
+        An expression template compiled for checking many instances of it quickly.
+
+        Compiling flattens the template into a list of steps that run in the same order as
+        check_types() would visit the tree. Every part of the template that does not depend on a
+        hole is checked once, up front: hole-free subtrees become constant types, and method and
+        constructor lookups on them are resolved in advance. Only the remaining operations run per
+        instance, and their verdict is remembered for each distinct combination of hole types, so
+        the common case of instances that differ only in names and values is a single cache lookup.
+        Only the max_verdicts most recently used combinations are remembered.
+
+        Given a CacheGroup, such as a TypeUniverse’s `caches`, the plan keeps its verdicts in the
+        group’s "verdicts" cache, shared with every other plan given the same group, so that their
+        statistics are reported and they are cleared along with the group’s other caches. Otherwise
+        it has a cache of its own.
+
+        Checking an instance gives exactly the same result type or error as calling check_types()
+        on the template with each hole replaced by its filler.
+        """
+    def __init__(self, template, scope=Scope.empty, max_verdicts=None, caches=None):
+        self.template = template  #: The expression this plan checks instances of (Expression)
+        self.holes = []           #: The template’s holes, in the order they are checked (list of Holes)
+        self.hits = 0             #: Instances whose verdict was already remembered
+        self.misses = 0           #: Instances that had to run the plan’s steps
+        if caches is None:
+            self.verdicts = LRUCache(max_verdicts or 1024)  #: Where verdicts are remembered (LRUCache)
+        else:
+            self.verdicts = caches.cache("verdicts", max_verdicts)
+        self._cache_key = next(_plan_ids)  # Tells this plan’s verdicts apart in a shared cache
+        self._hole_indices = {}
+        self._steps = []
+        self._has_holes = {}
+        self._find_holes(template)
+        self._compile(template, scope)
+
+    def check(self, fillers={}, scope=Scope.empty):
+        """
+            Checks the instance of the template whose holes are filled in with the given expressions
+            (a dict mapping hole names to Expressions). Holes without a filler keep their own type.
+            Returns the static type of the instance.
+
+            A filler with a type error only fails the instance if check_types() would have reached
+            it, so the error is the same one the tree checker reports.
+            """
+        filler_types = []
+        for hole in self.holes:
+            if hole.name not in fillers:
+                filler_types.append(hole.type)
+                continue
+            try:
+                filler_types.append(fillers[hole.name].check_types(scope))
+            except type_errors as error:
+                filler_types.append((type(error), error.args))
+        if any(isinstance(filler_type, tuple) for filler_type in filler_types):
+            return self._run(_FailedFillers(filler_types))  # Not cached: the verdict depends on the error
+        return self.check_hole_types(filler_types)
+
+    def check_hole_types(self, hole_types):
+        """
+            Checks the instance of the template whose holes have the given types, listed in the same
+            order as `holes`, and returns its static type.
+            """
+        hole_types = tuple(hole_types)
+        key = (self._cache_key, hole_types)
+        try:
+            verdict = self.verdicts[key]
+            self.hits += 1
+        except KeyError:
+            self.misses += 1
+            if len(hole_types) != len(self.holes):
+                raise ValueError("Expected types for {0} holes, got {1}".format(len(self.holes), len(hole_types)))
+            try:
+                verdict = self._run(hole_types)
+            except type_errors as error:
+                verdict = (type(error), error.args)
+            self.verdicts[key] = verdict
+
+        if isinstance(verdict, tuple):
+            error_class, error_args = verdict
+            raise error_class(*error_args)
+        return verdict
+
+    def _run(self, hole_types):
+        stack = []
+        for step in self._steps:
+            step(stack, hole_types)
+        return stack.pop()
+
+    # ––– Compilation –––
+
+    def _find_holes(self, node):
+        """ Records which nodes of the template have holes under them, without recursion.
+            """
+        pending = [(node, False)]
+        while pending:
+            node, children_done = pending.pop()
+            children = node.children()
+            if children_done or not children:
+                self._has_holes[id(node)] = isinstance(node, Hole) or any(
+                    self._has_holes[id(child)] for child in children)
+            else:
+                pending.append((node, True))
+                pending.extend((child, False) for child in children)
+
+    def _compile(self, template, scope):
+        """ Emits the template’s steps without recursion. Each node’s compiler emits any steps that
+            come before its children, and returns the rest of its work in order: child nodes to
+            compile, and steps to emit once those are done.
+            """
+        pending = [template]
+        while pending:
+            item = pending.pop()
+            if not isinstance(item, Expression):
+                self._steps.append(item)
+            elif not self._has_holes[id(item)]:
+                self._emit_folded(lambda: item.check_types(scope))
+            else:
+                try:
+                    compile = lookup_by_class(_compilers, item)
+                except KeyError:
+                    raise ValueError("Cannot compile {0} with holes in it".format(type(item).__name__))
+                pending.extend(reversed(compile(self, item, scope)))
+
+    def _compile_hole(self, hole, scope):
+        if hole.name not in self._hole_indices:
+            self._hole_indices[hole.name] = len(self.holes)
+            self.holes.append(hole)
+        index = self._hole_indices[hole.name]
+        self._steps.append(lambda stack, hole_types: stack.append(hole_types[index]))
+        return []
+
+    def _compile_method_call(self, call, scope):
+        method_name = call.method_name
+        argument_count = len(call.args)
+
+        if self._has_holes[id(call.receiver)]:
+            # The method depends on what fills the holes, so look it up for each instance
+            def resolve(stack, hole_types):
+                receiver_type = stack.pop()
+                method = resolve_method(receiver_type, method_name)
+                call_name = receiver_type.name + "." + method_name + "()"
+                check_argument_count(call_name, method.argument_types, argument_count)
+                stack.append((call_name, method))  # Stays under the arguments until finish()
+
+            def finish(stack, hole_types):
+                argument_types = _pop(stack, argument_count)
+                call_name, method = stack.pop()
+                check_argument_types(call_name, method.argument_types, argument_types)
+                stack.append(method.return_type)
+
+            return [call.receiver, resolve] + list(call.args) + [finish]
+        else:
+            # Resolve the method once, now
+            def resolve():
+                receiver_type = call.receiver.check_types(scope)
+                method = resolve_method(receiver_type, method_name)
+                call_name = receiver_type.name + "." + method_name + "()"
+                check_argument_count(call_name, method.argument_types, argument_count)
+                return call_name, method
+            resolved = self._emit_folded(resolve, push=False)
+            if resolved is None:
+                return self._compile_unreachable(call.args)
+            call_name, method = resolved
+            return self._compile_arguments(call, call_name, method.argument_types, method.return_type)
+
+    def _compile_constructor_call(self, call, scope):
+        instantiated_type = call.instantiated_type
+        call_name = instantiated_type.name + " constructor"
+
+        def resolve():
+            constructor = resolve_constructor(instantiated_type)
+            check_argument_count(call_name, constructor.argument_types, len(call.args))
+            return constructor
+        constructor = self._emit_folded(resolve, push=False)
+        if constructor is None:
+            return self._compile_unreachable(call.args)
+        return self._compile_arguments(call, call_name, constructor.argument_types, instantiated_type)
+
+    def _compile_field_access(self, access, scope):
+        field_name = access.field_name
+        return [
+            access.receiver,
+            lambda stack, hole_types: stack.append(resolve_field(stack.pop(), field_name).type)]
+
+    def _compile_binary_operation(self, operation, scope):
+        operator = operation.operator
+        return [
+            operation.left,
+            operation.right,
+            lambda stack, hole_types: stack.append(binary_result_type(operator, *_pop(stack, 2)))]
+
+    def _compile_cast(self, cast, scope):
+        target_type = cast.target_type
+        return [
+            cast.expression,
+            lambda stack, hole_types: stack.append(cast_result_type(stack.pop(), target_type))]
+
+    def _compile_arguments(self, call, call_name, expected_types, result_type):
+        argument_count = len(call.args)
+
+        def finish(stack, hole_types):
+            check_argument_types(call_name, expected_types, _pop(stack, argument_count))
+            stack.append(result_type)
+        return list(call.args) + [finish]
+
+    def _compile_unreachable(self, nodes):
+        """ The work for nodes that come after a step that always fails. Their steps never run, but
+            any holes in them still need to be listed.
+            """
+        return list(nodes)
+
+    def _emit_folded(self, check, push=True):
+        """ Runs a check that does not depend on any hole now. If it fails, every instance fails
+            the same way at this point, so emit a step that raises the error; if it succeeds,
+            optionally emit a step that pushes its result.
+            """
+        try:
+            result = check()
+        except type_errors as error:
+            error_class, error_args = type(error), error.args
+
+            def fail(stack, hole_types):
+                raise error_class(*error_args)
+            self._steps.append(fail)
+            return None
+
+        if push:
+            self._steps.append(lambda stack, hole_types: stack.append(result))
+        return result
+
+
+#: How CheckingPlan compiles each kind of Expression that has holes in it
+_compilers = {
+    Hole:            CheckingPlan._compile_hole,
+    MethodCall:      CheckingPlan._compile_method_call,
+    ConstructorCall: CheckingPlan._compile_constructor_call,
+    FieldAccess:     CheckingPlan._compile_field_access,
+    BinaryOperation: CheckingPlan._compile_binary_operation,
+    Cast:            CheckingPlan._compile_cast,
+}
+
+
+class _FailedFillers(list):
+    """ The types of an instance’s fillers, some of which are (error class, args) for a filler that
+        failed to check. Reading one of those raises its error, when its hole’s step runs.
+        """
+    def __getitem__(self, index):
+        filler_type = super().__getitem__(index)
+        if isinstance(filler_type, tuple):
+            error_class, error_args = filler_type
+            raise error_class(*error_args)
+        return filler_type
+
+
+def _pop(stack, count):
+    """ Removes and returns the top count entries of the stack, bottom first.
+        """
+    if count == 0:
+        return []
+    values = stack[-count:]
+    del stack[-count:]
+    return values
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+
+class Scope(object):
+    """
+        The local variables visible at some point in a Java method body, mapping each name to its
+        declared type.
+
+        Scopes are immutable: declare() returns a new Scope that shares all of its structure with
+        the old one, so a block can enter a nested scope by simply passing its current Scope along,
+        and leave it by going back to the Scope it started with. Nothing is ever copied wholesale.
+        The bindings live in a hash trie, so both lookups and declarations take O(log n) time even
+        for bodies with thousands of locals.
+        """
+    def __init__(self, root=None, size=0):
+        self._root = root
+        self._size = size
+
+    def declare(self, name, declared_type):
+        """ Returns a new scope that has everything in this one, plus the given variable.
+            """
+        key_hash = hash(name)
+        return Scope(
+            _insert(self._root, key_hash, name, declared_type, 0),
+            self._size + (0 if name in self else 1))
+
+    def lookup(self, name):
+        """ Returns the declared type of the variable with the given name.
+            """
+        node = self._root
+        key_hash = hash(name)
+        shift = 0
+        while node is not None:
+            if isinstance(node, _Leaf):
+                if node.hash == key_hash:
+                    for entry_name, entry_type in node.entries:
+                        if entry_name == name:
+                            return entry_type
+                break
+            node = node.children[(key_hash >> shift) & _MASK]
+            shift += _BITS
+        raise NoSuchVariable("Cannot find variable {0}".format(name))
+
+    def __contains__(self, name):
+        try:
+            self.lookup(name)
+            return True
+        except NoSuchVariable:
+            return False
+
+    def __len__(self):
+        return self._size
+
+
+class NoSuchVariable(Exception):
+    pass
+
+
+Scope.empty = Scope()
+
+
+# ––– Persistent hash trie behind Scope –––
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_EMPTY_CHILDREN = (None,) * (1 << _BITS)
+
+
+class _Leaf(object):
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, hash, entries):
+        self.hash = hash        #: The hash shared by every name in this leaf
+        self.entries = entries  #: (name, type) pairs; more than one only on a full hash collision
+
+
+class _Branch(object):
+    __slots__ = ("children",)
+
+    def __init__(self, children):
+        self.children = children  #: Tuple of child nodes indexed by the next few bits of the hash
+
+
+def _insert(node, key_hash, name, value, shift):
+    """ Returns a copy of the trie rooted at node with name bound to value, copying only the
+        nodes on the path to that name.
+        """
+    if node is None:
+        return _Leaf(key_hash, ((name, value),))
+
+    if isinstance(node, _Leaf):
+        if node.hash == key_hash:
+            entries = tuple(entry for entry in node.entries if entry[0] != name)
+            return _Leaf(key_hash, entries + ((name, value),))
+        children = list(_EMPTY_CHILDREN)
+        children[(node.hash >> shift) & _MASK] = node
+        node = _Branch(tuple(children))
+
+    index = (key_hash >> shift) & _MASK
+    children = list(node.children)
+    children[index] = _insert(children[index], key_hash, name, value, shift + _BITS)
+    return _Branch(tuple(children))
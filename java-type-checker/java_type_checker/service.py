@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .scopes import Scope
+from .expressions import type_errors
+
+
+class Diagnostic(namedtuple("Diagnostic", ["kind", "message"])):
+    """ A problem found while checking an expression: the kind of error (the name of the exception
+        class, e.g. "JavaTypeError" or "NoSuchMethod") and its message.
+        """
+    __slots__ = ()
+
+
+class CheckResult(namedtuple("CheckResult", ["static_type", "diagnostics"])):
+    """ The outcome of checking one expression: its static type if it checked cleanly (otherwise
+        None), and the list of Diagnostics found.
+        """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return not self.diagnostics
+
+
+def check_batch(requests):
+    """ Checks a list of (expression, scope) pairs, returning a CheckResult for each. This is what
+        the service’s worker threads run; it never raises for errors in the checked code. A request
+        that makes the checker itself fail, such as a malformed expression, gets an "InternalError"
+        diagnostic, so it cannot take the other requests in its batch down with it.
+        """
+    results = []
+    for expression, scope in requests:
+        try:
+            results.append(CheckResult(expression.check_types(scope), []))
+        except type_errors as error:
+            results.append(CheckResult(None, [Diagnostic(type(error).__name__, str(error))]))
+        except Exception as error:
+            results.append(CheckResult(None, [Diagnostic(
+                "InternalError",
+                "{0}: {1}".format(type(error).__name__, error))]))
+    return results
+
+
+class CheckingService(object):
+    """
+        An asyncio front end for the type checker, for use from async servers.
+
+        Callers await check(); the service gathers concurrent requests into small batches and
+        checks each batch on a worker thread, so the event loop never runs the checker itself. All
+        workers share one TypeUniverse, which the service freezes so that they can read it without
+        locks.
+
+        At most max_pending requests wait in the queue at once; beyond that, check() waits for room
+        instead of queueing unboundedly. Each batch is sent off once it has max_batch_size requests,
+        or max_batch_delay seconds after its first request arrived, whichever comes first.
+
+        Use it as an async context manager:
+
+            async with CheckingService(universe) as service:
+                result = await service.check(expression)
+        """
+    def __init__(self, universe, workers=4, max_batch_size=64, max_batch_delay=0.001, max_pending=1024):
+        self.universe = universe
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_pending = max_pending
+        self.metrics = ServiceMetrics()
+        self.is_running = False  #: True between start() and stop(), while check() accepts requests
+
+        self._queue = None
+        self._executor = None
+        self._worker_slots = None
+        self._batcher = None
+        self._batches_in_flight = set()
+
+    async def start(self):
+        """ Freezes the universe and starts accepting requests.
+            """
+        if self.is_running:
+            raise RuntimeError("CheckingService is already running")
+        self.universe.freeze()
+        self._queue = asyncio.Queue(self.max_pending)
+        self._executor = ThreadPoolExecutor(self.workers)
+        self._worker_slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.ensure_future(self._run_batches())
+        self.is_running = True
+
+    async def stop(self):
+        """ Stops accepting requests, finishes all requests already submitted, then shuts down the
+            worker threads. Does nothing if the service is not running.
+            """
+        if not self.is_running:
+            return
+        self.is_running = False
+        await self._queue.join()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        if self._batches_in_flight:
+            await asyncio.wait(self._batches_in_flight)
+        self._executor.shutdown()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def check(self, expression, scope=Scope.empty):
+        """ Checks an expression against the service’s universe, returning a CheckResult. Raises
+            RuntimeError if the service is not running.
+            """
+        if not self.is_running:
+            raise RuntimeError("CheckingService is not running: call start() first, or use it with `async with`")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((expression, scope, future, time.perf_counter()))
+        return await future
+
+    async def check_all(self, expressions, scope=Scope.empty):
+        """ Checks several expressions concurrently, returning their CheckResults in order.
+            """
+        return await asyncio.gather(*[self.check(expression, scope) for expression in expressions])
+
+    # ––– Batching –––
+
+    async def _run_batches(self):
+        while True:
+            await self._worker_slots.acquire()
+            batch = [await self._queue.get()]
+            self._take_queued(batch)
+            if len(batch) < self.max_batch_size and self.max_batch_delay > 0:
+                await asyncio.sleep(self.max_batch_delay)
+                self._take_queued(batch)
+
+            task = asyncio.ensure_future(self._check_batch(batch))
+            self._batches_in_flight.add(task)
+            task.add_done_callback(self._batches_in_flight.discard)
+
+    def _take_queued(self, batch):
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _check_batch(self, batch):
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                check_batch,
+                [(expression, scope) for expression, scope, future, submitted in batch])
+        except Exception as error:
+            for expression, scope, future, submitted in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            finished = time.perf_counter()
+            for (expression, scope, future, submitted), result in zip(batch, results):
+                if not future.done():  # The caller may have given up waiting
+                    future.set_result(result)
+                self.metrics.record_request(finished - submitted)
+            self.metrics.record_batch()
+        finally:
+            for request in batch:
+                self._queue.task_done()
+            self._worker_slots.release()
+
+
+class ServiceMetrics(object):
+    """ Counts requests and batches, and keeps the latencies of the most recent requests.
+        """
+    def __init__(self, latency_window=10000):
+        self.requests = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=latency_window)  #: Seconds from submission to result
+
+    def record_request(self, latency):
+        self.requests += 1
+        self.latencies.append(latency)
+
+    def record_batch(self):
+        self.batches += 1
+
+    def summary(self):
+        """ Returns a dict of request and batch counts, mean batch size, and latency percentiles
+            (in seconds) over the recent requests.
+            """
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else None,
+            "latency_p50": percentile(0.50),
+            "latency_p90": percentile(0.90),
+            "latency_p99": percentile(0.99),
+            "latency_max": latencies[-1] if latencies else None,
+        }
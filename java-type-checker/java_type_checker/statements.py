@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+from .types import Type
+from .scopes import Scope
+from .expressions import JavaTypeError
+
+
+class Statement(object):
+    """
+        AST for simple Java statements. Statements do not have types; instead, checking one may
+        change which local variables are in scope for the statements that follow it.
+        """
+
+    def check_types(self, scope=Scope.empty):
+        """
+            Validates this statement against the local variables in the given Scope, and returns
+            the Scope that subsequent statements in the same block should be checked against.
+            Subclasses must implement this method.
+            """
+        pass
+
+
+class ExpressionStatement(Statement):
+    """ An expression evaluated for its side effects, e.g. `rect.setFillColor(red);`.
+        """
+    def __init__(self, expression):
+        self.expression = expression  #: The expression to evaluate (Expression)
+
+    def check_types(self, scope=Scope.empty):
+        self.expression.check_types(scope)
+        return scope
+
+
+class LocalDeclaration(Statement):
+    """ A local variable declaration with an optional initializer, e.g. `Point p = new Point(0, 0);`.
+        """
+    def __init__(self, name, declared_type, initializer=None):
+        self.name = name                    #: The name of the new variable (String)
+        self.declared_type = declared_type  #: The declared type of the variable (Type)
+        self.initializer = initializer      #: The initial value, if any (Expression or None)
+
+    def check_types(self, scope=Scope.empty):
+        if self.name in scope:
+            raise JavaTypeError(
+                "Variable {0} is already defined in this scope".format(
+                    self.name))
+
+        if self.declared_type is Type.void or self.declared_type is Type.null:
+            raise JavaTypeError(
+                "Variable {0} cannot have type {1}".format(
+                    self.name,
+                    self.declared_type.name))
+
+        if self.initializer is not None:
+            initializer_type = self.initializer.check_types(scope)
+            if not initializer_type.is_assignable_to(self.declared_type):
+                raise JavaTypeError(
+                    "Incompatible types: {0} cannot be converted to {1}".format(
+                        initializer_type.name,
+                        self.declared_type.name))
+
+        return scope.declare(self.name, self.declared_type)
+
+
+class Block(Statement):
+    """ A sequence of statements in braces, e.g. `{ Point p; p.getX(); }`. Variables declared inside
+        the block go out of scope at its end.
+        """
+    def __init__(self, *statements):
+        self.statements = statements  #: The statements in the block (list of Statements)
+
+    def check_types(self, scope=Scope.empty):
+        inner_scope = scope
+        for statement in self.statements:
+            inner_scope = statement.check_types(inner_scope)
+        return scope
@@ -1,24 +1,44 @@
 # -*- coding: utf-8 -*-
 
+from types import MappingProxyType
+
 
 class Type(object):
     """ Represents any Java type, including both class types and primitives.
+
+        A type can be frozen once it is complete. After that it refuses any changes, and answers
+        questions such as is_subtype_of() from precomputed tables that are never modified again,
+        so any number of threads can read them at once without locking.
         """
+    is_frozen = False  #: True once freeze() has made this type immutable
+
     def __init__(self, name, direct_supertypes=[]):
         self.name = name
         self.direct_supertypes = direct_supertypes
         self.is_instantiable = False
-    
+        self.is_primitive = True
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("is_frozen"):
+            raise FrozenTypeError("Cannot change {0} of frozen type {1}".format(name, self.name))
+        super().__setattr__(name, value)
+
     def is_subtype_of(self, other):
         """ True if this type can be used where the other type is expected.
             """
+        if self.is_frozen:
+            return other in self._ancestors
         if self is other:
             return True
-        elif other in self.direct_supertypes:
-            return True
-        for type in self.direct_supertypes:
-            if other in type.direct_supertypes:
+        visited = set()
+        pending = list(self.direct_supertypes)
+        while pending:
+            type = pending.pop()
+            if type is other:
                 return True
+            if type not in visited:
+                visited.add(type)
+                pending.extend(type.direct_supertypes)
         return False
 
     def is_supertype_of(self, other):
@@ -26,16 +46,95 @@ class Type(object):
         """
         return other.is_subtype_of(self)
 
+    def is_assignable_to(self, other):
+        """ True if a value of this type can be passed where the other type is expected, allowing
+            widening primitive conversions (e.g. int → double) but never boxing.
+            """
+        if self.is_primitive or other.is_primitive:
+            return other in primitive_widenings.get(self, ())
+        return self.is_subtype_of(other)
+
+    def freeze(self):
+        """ Makes this type and all of its supertypes immutable, building their lookup tables.
+            Freezing must finish in one thread before other threads read the type.
+            """
+        for type in _unfrozen_supertypes_first(self):
+            type._build_tables()
+            # Set last: until this point, readers still use the slower unfrozen code paths
+            object.__setattr__(type, "is_frozen", True)
+
+    def _build_tables(self):
+        """ Computes the lookup tables a frozen type uses. All supertypes are already frozen.
+            """
+        object.__setattr__(self, "direct_supertypes", tuple(self.direct_supertypes))
+        ancestors = {self}
+        for supertype in self.direct_supertypes:
+            ancestors |= supertype._ancestors
+        object.__setattr__(self, "_ancestors", frozenset(ancestors))
 
 
-class Constructor(object):
+def _unfrozen_supertypes_first(root):
+    """ Returns root and its unfrozen ancestors, each after all of its own supertypes.
+        """
+    if root.is_frozen:
+        return []
+    order = []
+    visited = {root}
+    path = [root]
+    on_path = {root}
+    stack = [iter(root.direct_supertypes)]
+    while stack:
+        supertype = next(stack[-1], None)
+        if supertype is None:
+            stack.pop()
+            finished = path.pop()
+            on_path.discard(finished)
+            order.append(finished)
+        elif supertype in on_path:
+            raise ValueError("Inheritance cycle through {0}".format(supertype.name))
+        elif supertype not in visited and not supertype.is_frozen:
+            visited.add(supertype)
+            path.append(supertype)
+            on_path.add(supertype)
+            stack.append(iter(supertype.direct_supertypes))
+    return order
+
+
+
+class Declaration(object):
+    """ Base for the constructors, methods and fields that make up a type. They are frozen along
+        with the type that declares them, after which they refuse any changes too.
+        """
+    is_frozen = False  #: True once a type declaring this has been frozen
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("is_frozen"):
+            raise FrozenTypeError("Cannot change {0} of frozen {1}".format(name, self.describe()))
+        super().__setattr__(name, value)
+
+    def describe(self):
+        """ What this declaration is, for error messages, e.g. "method getX".
+            """
+        return type(self).__name__.lower() + " " + self.name
+
+    def freeze(self):
+        if not self.is_frozen:
+            if hasattr(self, "argument_types"):
+                object.__setattr__(self, "argument_types", tuple(self.argument_types))
+            object.__setattr__(self, "is_frozen", True)
+
+
+class Constructor(Declaration):
     """ The declaration of a Java constructor.
         """
     def __init__(self, argument_types=[]):
         self.argument_types = argument_types
 
+    def describe(self):
+        return "constructor"
+
 
-class Method(object):
+class Method(Declaration):
     """ The declaration of a Java method.
         """
     def __init__(self, name, argument_types=[], return_type=None):
@@ -44,6 +143,14 @@ class Method(object):
         self.return_type = return_type
 
 
+class Field(Declaration):
+    """ The declaration of a Java field.
+        """
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+
 class ClassOrInterface(Type):
     """
         Describes the API of a class-like Java type (class or interface).
@@ -52,16 +159,23 @@ class ClassOrInterface(Type):
         distinction makes no difference to us here: we are only checking types, not
         compiling or executing code, so none of the methods have implementations.)
         """
-    def __init__(self, name, direct_supertypes=[], constructor=Constructor([]), methods=[]):
+    def __init__(self, name, direct_supertypes=[], constructor=None, methods=[], fields=[]):
         super().__init__(name, direct_supertypes)
         self.name = name
-        self.constructor = constructor
+        self.constructor = constructor if constructor is not None else Constructor([])
         self.methods = {method.name: method for method in methods}
+        self.fields = {field.name: field for field in fields}
         self.is_instantiable = True
+        self.is_primitive = False
     
     def method_named(self, name):
         """ Returns the Method with the given name, which may come from a supertype.
             """
+        if self.is_frozen:
+            try:
+                return self._method_table[name]
+            except KeyError:
+                raise NoSuchMethod("{0} has no method named {1}".format(self.name, name))
         try:
             return self.methods[name]
         except KeyError:
@@ -72,12 +186,51 @@ class ClassOrInterface(Type):
                     pass
             raise NoSuchMethod("{0} has no method named {1}".format(self.name, name))
 
+    def field_named(self, name):
+        """ Returns the Field with the given name, which may come from a supertype.
+            """
+        if self.is_frozen:
+            try:
+                return self._field_table[name]
+            except KeyError:
+                raise NoSuchField("{0} has no field named {1}".format(self.name, name))
+        try:
+            return self.fields[name]
+        except KeyError:
+            for supertype in self.direct_supertypes:
+                try:
+                    return supertype.field_named(name)
+                except NoSuchField:
+                    pass
+            raise NoSuchField("{0} has no field named {1}".format(self.name, name))
+
+    def _build_tables(self):
+        super()._build_tables()
+        for declaration in list(self.methods.values()) + list(self.fields.values()) + [self.constructor]:
+            declaration.freeze()
+
+        # Same precedence as the unfrozen lookups: own members, then each supertype in order
+        method_table = {}
+        field_table = {}
+        for supertype in reversed(self.direct_supertypes):
+            if isinstance(supertype, ClassOrInterface):
+                method_table.update(supertype._method_table)
+                field_table.update(supertype._field_table)
+        method_table.update(self.methods)
+        field_table.update(self.fields)
+
+        object.__setattr__(self, "methods", MappingProxyType(dict(self.methods)))
+        object.__setattr__(self, "fields", MappingProxyType(dict(self.fields)))
+        object.__setattr__(self, "_method_table", MappingProxyType(method_table))
+        object.__setattr__(self, "_field_table", MappingProxyType(field_table))
+
 
 class NullType(Type):
     """ The type of the value `null` in Java.
         """
     def __init__(self):
         super().__init__("null")
+        self.is_primitive = False
     
     def is_subtype_of(self, other):
         return True
@@ -86,11 +239,24 @@ class NullType(Type):
         raise NoSuchMethod("Cannot invoke method {0} on null".format(
                                                                      name + "()"))
 
+    def field_named(self, name):
+        raise NoSuchField("Cannot access field {0} on null".format(name))
+
 
 class NoSuchMethod(Exception):
     pass
 
 
+class NoSuchField(Exception):
+    pass
+
+
+class FrozenTypeError(Exception):
+    """ Indicates an attempt to modify a type after it was frozen.
+        """
+    pass
+
+
 # Our simple language’s built-in types
 
 Type.void    = Type("void")
@@ -101,8 +267,21 @@ Type.double  = Type("double")
 
 Type.null    = NullType()
 
+_object_equals = Method("equals", return_type=Type.boolean)
 Type.object = ClassOrInterface("Object",
                                methods=[
-                                        Method("equals", argument_types=[object], return_type=Type.boolean),
+                                        _object_equals,
                                         Method("hashCode", return_type=Type.int),
                                         ])
+_object_equals.argument_types = [Type.object]  # Object.equals() takes an Object
+
+for _builtin in (Type.void, Type.boolean, Type.int, Type.double, Type.null, Type.object):
+    _builtin.freeze()
+
+# Java’s widening primitive conversions: the primitive types each primitive may be passed as
+
+primitive_widenings = {
+    Type.boolean: (Type.boolean,),
+    Type.int:     (Type.int, Type.double),
+    Type.double:  (Type.double,),
+}
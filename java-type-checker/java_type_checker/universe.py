@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from .types import FrozenTypeError
+from .validation import builtin_types, validate_types
+from .index import TypeIndex
+from .caching import CacheGroup
+
+
+class TypeUniverse(object):
+    """
+        All the types that one project’s code can refer to: the built-in types plus the project’s
+        own classes and interfaces, each identified by name.
+
+        Once the universe is complete, freeze() validates it and freezes every type in it, after
+        which any number of checker threads can share it without locks.
+
+        The universe keeps a TypeIndex of its types up to date as they are added, for reverse
+        queries such as finding all the subtypes of a type. Results computed from its types are
+        cached in its `caches`, which are bounded in size; a process that moves on to another
+        universe can clear them all at once.
+        """
+    def __init__(self, types=()):
+        self.is_frozen = False      #: True once freeze() has made this universe immutable
+        self.index = TypeIndex()    #: Reverse lookups over the types in this universe (TypeIndex)
+        self.caches = CacheGroup()  #: Caches of results that depend on these types (CacheGroup)
+        self._types = {}
+        for type in builtin_types + tuple(types):
+            self.add(type)
+
+    def add(self, type):
+        """ Adds a type to the universe. Adding the same type twice has no effect.
+            """
+        if self.is_frozen:
+            raise FrozenTypeError("Cannot add {0} to a frozen type universe".format(type.name))
+        existing = self._types.get(type.name)
+        if existing is type:
+            return
+        if existing is not None:
+            raise ValueError("Type universe already has a type named {0}".format(type.name))
+        self._types[type.name] = type
+        self.index.add(type)
+
+    def freeze(self):
+        """ Checks that the universe is consistent (see validate_types()) and then freezes every
+            type in it. Raises InvalidTypeModel, leaving everything unfrozen, if it is not.
+            """
+        if self.is_frozen:
+            return
+        validate_types(self._types.values())
+        for type in self._types.values():
+            type.freeze()
+        self.is_frozen = True
+
+    def __getitem__(self, name):
+        return self._types[name]
+
+    def __contains__(self, name):
+        return name in self._types
+
+    def __iter__(self):
+        return iter(list(self._types.values()))
+
+    def __len__(self):
+        return len(self._types)
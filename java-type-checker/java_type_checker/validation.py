@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+from .types import Type, ClassOrInterface
+
+
+class InvalidTypeModel(Exception):
+    """ Indicates that a set of type declarations is inconsistent, e.g. because of an inheritance
+        cycle. Lists every problem found, not just the first.
+        """
+    def __init__(self, problems):
+        super().__init__("\n".join(problems))
+        self.problems = problems  #: Descriptions of each problem found (list of strings)
+
+
+builtin_types = (Type.void, Type.boolean, Type.int, Type.double, Type.null, Type.object)
+
+
+def validate_types(types):
+    """ Raises InvalidTypeModel if the given types, together with the built-in types, do not form a
+        consistent type universe. See find_problems().
+        """
+    problems = find_problems(types)
+    if problems:
+        raise InvalidTypeModel(problems)
+
+
+def find_problems(types):
+    """
+        Checks a whole universe of types at once, and returns a description of each problem found:
+
+        - references to things that are not Types at all (e.g. Python’s `int` instead of `Type.int`),
+        - references to Types outside the universe,
+        - supertypes that are not classes or interfaces, and misplaced void or null types,
+        - inheritance cycles, which would make method lookup recurse forever, and
+        - methods whose signatures conflict with the ones they override or inherit.
+
+        This only reads the declarations, never method_named() or other lookups, so it is safe to
+        run on untrusted input before anything is cached. The reference checks and cycle detection
+        visit each type, supertype edge, and declaration once; override checking additionally
+        costs time proportional to the number of methods each type inherits.
+        """
+    universe = list(builtin_types) + [type for type in types if type not in builtin_types]
+    members = set(universe)
+    problems = []
+
+    for type in universe:
+        for problem in _reference_problems(type, members):
+            problems.append("{0}: {1}".format(_name_of(type), problem))
+
+    order, cycle_problems = _supertypes_first(universe)
+    problems += cycle_problems
+    if not problems:
+        problems += _override_problems(order)
+    return problems
+
+
+# ––– References –––
+
+def _name_of(thing):
+    return thing.name if isinstance(thing, Type) else repr(thing)
+
+
+def _check_reference(thing, role, universe):
+    if not isinstance(thing, Type):
+        return "{0} {1} is not a Type".format(role, repr(thing))
+    if thing not in universe:
+        return "{0} {1} is not in the type universe".format(role, thing.name)
+    return None
+
+
+def _reference_problems(type, universe):
+    if not isinstance(type, Type):
+        yield "is not a Type"
+        return
+
+    for supertype in type.direct_supertypes:
+        problem = _check_reference(supertype, "supertype", universe)
+        if problem:
+            yield problem
+        elif not isinstance(supertype, ClassOrInterface):
+            yield "supertype {0} is not a class or interface".format(supertype.name)
+
+    if not isinstance(type, ClassOrInterface):
+        return
+
+    signatures = [("constructor", type.constructor.argument_types, None)]
+    signatures += [(method.name + "()", method.argument_types, method.return_type)
+                   for method in type.methods.values()]
+    for member_name, argument_types, return_type in signatures:
+        for argument_type in argument_types:
+            problem = (_check_reference(argument_type, member_name + " argument type", universe)
+                       or _check_value_type(argument_type, member_name + " argument type"))
+            if problem:
+                yield problem
+        if member_name != "constructor":
+            if return_type is None:
+                yield "{0} has no return type".format(member_name)
+            else:
+                problem = _check_reference(return_type, member_name + " return type", universe)
+                if problem:
+                    yield problem
+                elif return_type is Type.null:
+                    yield "{0} return type cannot be null".format(member_name)
+
+    for field in type.fields.values():
+        role = "field " + field.name + " type"
+        problem = _check_reference(field.type, role, universe) or _check_value_type(field.type, role)
+        if problem:
+            yield problem
+
+
+def _check_value_type(type, role):
+    if type is Type.void or type is Type.null:
+        return "{0} cannot be {1}".format(role, type.name)
+    return None
+
+
+# ––– Cycles –––
+
+_UNVISITED, _IN_PROGRESS, _DONE = 0, 1, 2
+
+
+def _supertypes_first(universe):
+    """ Returns the classes and interfaces of the universe ordered so that every type comes after
+        all of its supertypes, plus a description of any inheritance cycles. Uses an explicit stack
+        instead of recursion so that deep hierarchies do not hit Python’s recursion limit.
+        """
+    state = {}
+    order = []
+    problems = []
+    for root in universe:
+        if not isinstance(root, ClassOrInterface) or state.get(root, _UNVISITED) != _UNVISITED:
+            continue
+        state[root] = _IN_PROGRESS
+        path = [root]
+        stack = [iter(_class_supertypes(root))]
+        while stack:
+            supertype = next(stack[-1], None)
+            if supertype is None:
+                stack.pop()
+                finished = path.pop()
+                state[finished] = _DONE
+                order.append(finished)
+            elif state.get(supertype, _UNVISITED) == _UNVISITED:
+                state[supertype] = _IN_PROGRESS
+                path.append(supertype)
+                stack.append(iter(_class_supertypes(supertype)))
+            elif state[supertype] == _IN_PROGRESS:
+                cycle = path[path.index(supertype):] + [supertype]
+                problems.append("Inheritance cycle: " + " → ".join(t.name for t in cycle))
+    return order, problems
+
+
+def _class_supertypes(type):
+    return [supertype for supertype in type.direct_supertypes if isinstance(supertype, ClassOrInterface)]
+
+
+# ––– Overrides –––
+
+def _override_problems(order):
+    problems = []
+    tables = {}  # type → {method name: (declaring type, Method)}
+    for type in order:
+        supertypes = _class_supertypes(type)
+        if len(supertypes) == 1 and not type.methods:
+            tables[type] = tables[supertypes[0]]  # Nothing new: share the supertype’s table
+            continue
+
+        table = {}
+        for supertype in supertypes:
+            for name, (owner, method) in tables[supertype].items():
+                if name in table and table[name][1] is not method and name not in type.methods:
+                    other_owner, other_method = table[name]
+                    if not _is_compatible_override(method, other_method) \
+                            and not _is_compatible_override(other_method, method):
+                        problems.append(
+                            "{0}: inherits conflicting declarations of {1}() from {2} and {3}".format(
+                                type.name, name, other_owner.name, owner.name))
+                table.setdefault(name, (owner, method))
+
+        for name, method in type.methods.items():
+            if name in table:
+                owner, overridden = table[name]
+                if not _is_compatible_override(method, overridden):
+                    problems.append(
+                        "{0}: {1}() conflicts with the declaration it overrides in {2}".format(
+                            type.name, name, owner.name))
+            table[name] = (type, method)
+        tables[type] = table
+    return problems
+
+
+def _is_compatible_override(method, overridden):
+    """ Java requires an override to take exactly the same argument types, and allows it to
+        narrow the return type of a reference-returning method.
+        """
+    if len(method.argument_types) != len(overridden.argument_types):
+        return False
+    if any(a is not b for a, b in zip(method.argument_types, overridden.argument_types)):
+        return False
+    if method.return_type.is_primitive or overridden.return_type.is_primitive:
+        return method.return_type is overridden.return_type
+    return method.return_type.is_subtype_of(overridden.return_type)
@@ -7,6 +7,7 @@ This file contains types declarations used by the unit tests which model the fol
 Java structure, loosely modeled after Bret Jackson’s graphics library from COMP 124:
 
     class Point {
+        double x, y;
         double getX();
         double getY();
         Point(double x, double y);
@@ -19,6 +20,7 @@ Java structure, loosely modeled after Bret Jackson’s graphics library from COM
     }
 
     class GraphicsObject {
+        Point position;
         abstract double getX();
         abstract double getY();
         abstract Point getPosition();
@@ -63,6 +65,10 @@ class Graphics:
         methods=[
             Method("getX", return_type=Type.double),
             Method("getY", return_type=Type.double),
+        ],
+        fields=[
+            Field("x", Type.double),
+            Field("y", Type.double),
         ]
     )
 
@@ -82,6 +88,9 @@ class Graphics:
             Method("getY", return_type=Type.double),
             Method("getPosition", return_type=point),
             Method("setPosition", return_type=Type.void, argument_types=[Type.double, Type.double]),
+        ],
+        fields=[
+            Field("position", point),
         ]
     )
 
@@ -91,7 +100,7 @@ class Graphics:
 
     color = ClassOrInterface("Color",
         direct_supertypes=[paint],
-        constructor=Constructor([int, int, int])
+        constructor=Constructor([Type.int, Type.int, Type.int])
     )
 
     fill_colorable = ClassOrInterface("FillColorable",
@@ -128,3 +137,6 @@ class Graphics:
             Method("getSize", return_type=size),
         ]
     )
+
+
+Graphics.all_types = [value for value in vars(Graphics).values() if isinstance(value, Type)]
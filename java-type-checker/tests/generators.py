@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+Random type hierarchies and expressions for differential and scaling tests. Everything is driven by
+a random.Random, so a failing case can be reproduced from its seed.
+"""
+
+from java_type_checker import *
+from tests import reference
+
+
+PRIMITIVES = [Type.boolean, Type.int, Type.double]
+OPERATORS = ["+", "-", "*", "/", "%", "<", "<=", ">", ">=", "&&", "||", "==", "!="]
+
+
+def random_hierarchy(rng, size, max_interfaces=3, methods_per_type=3, method_names=40, chain=False):
+    """
+        Returns a list of `size` new classes and interfaces. Each type extends one earlier type (or
+        Object) plus up to max_interfaces more, so the hierarchy is full of diamonds. With
+        chain=True, the one type each type extends is the previous one, making the hierarchy as
+        deep as possible.
+
+        Every method or field name has one signature across the whole hierarchy, so overrides are
+        always consistent and the result passes validate_types().
+        """
+    types = []
+    signatures = {}
+    field_types = {}
+
+    def random_type():
+        return rng.choice(PRIMITIVES + types) if types and rng.random() < 0.6 else rng.choice(PRIMITIVES)
+
+    for i in range(size):
+        if not types:
+            supertypes = [Type.object]
+        else:
+            supertypes = [types[-1] if chain else rng.choice(types)]
+            for j in range(rng.randint(0, max_interfaces)):
+                extra = rng.choice(types)
+                if extra not in supertypes:
+                    supertypes.append(extra)
+
+        methods = []
+        for j in range(rng.randint(0, methods_per_type)):
+            name = "m" + str(rng.randrange(method_names))
+            if name not in signatures:
+                signatures[name] = (
+                    [random_type() for k in range(rng.randint(0, 3))],
+                    rng.choice([Type.void] + PRIMITIVES + types) if types else Type.int)
+            if all(method.name != name for method in methods):
+                argument_types, return_type = signatures[name]
+                methods.append(Method(name, argument_types=argument_types, return_type=return_type))
+
+        fields = []
+        if rng.random() < 0.5:
+            name = "f" + str(rng.randrange(method_names))
+            field_types.setdefault(name, random_type())
+            fields.append(Field(name, field_types[name]))
+
+        types.append(ClassOrInterface("T" + str(i),
+            direct_supertypes=supertypes,
+            constructor=Constructor([random_type() for k in range(rng.randint(0, 2))]),
+            methods=methods,
+            fields=fields))
+    return types
+
+
+class ExpressionGenerator(object):
+    """
+        Builds random expressions over a list of types. Expressions are well typed by construction,
+        except that with probability error_rate each node makes a deliberate mistake (a wrong type,
+        name, or argument count) and leaves may be `null`, so both the passing and failing paths of a
+        checker get exercised.
+        """
+    def __init__(self, rng, types, error_rate=0.05, null_rate=0.1, holes=False):
+        self.rng = rng
+        self.types = [Type.object] + list(types)
+        self.error_rate = error_rate
+        self.null_rate = null_rate  #: How often a leaf of reference type is `null`
+        self.holes = holes  #: Use Holes instead of variables and literals as leaves
+        self._hole_count = 0
+        self._returning = {}  # type → [(receiver type, Method)] whose result is assignable to it
+        self._subtypes = {      # type → [generated types that are its subtypes]
+            supertype: [type for type in self.types if reference.is_subtype(type, supertype)]
+            for supertype in self.types}
+        for type in self.types:
+            for method in self._methods(type):
+                if method.return_type is not Type.void:
+                    for supertype in self.types + PRIMITIVES:
+                        if reference.is_assignable(method.return_type, supertype):
+                            self._returning.setdefault(supertype, []).append((type, method))
+
+    def expression(self, depth, want=None):
+        """ Returns an expression about depth levels deep, usually of a type assignable to want.
+            """
+        rng = self.rng
+        if rng.random() < self.error_rate:
+            want = self._any_type()
+        if want is None:
+            want = self._any_type()
+        if depth <= 0:
+            return self._leaf(want)
+
+        choice = rng.random()
+        if choice < 0.45 and self._returning.get(want):
+            receiver_type, method = rng.choice(self._returning[want])
+            name = method.name if rng.random() >= self.error_rate else method.name + "x"
+            args = [self.expression(depth - 1, argument_type) for argument_type in method.argument_types]
+            if rng.random() < self.error_rate:
+                args.append(self._leaf(Type.int))
+            return MethodCall(self.expression(depth - 1, receiver_type), name, *args)
+        if choice < 0.6 and not want.is_primitive:
+            candidates = self._subtypes.get(want) or [want]
+            type = rng.choice(candidates)
+            args = [self.expression(depth - 1, argument_type) for argument_type in type.constructor.argument_types]
+            return ConstructorCall(type, *args)
+        if choice < 0.7:
+            holders = [(type, field) for type in self.types for field in type.fields.values()
+                       if reference.is_assignable(field.type, want)]
+            if holders:
+                type, field = rng.choice(holders)
+                return FieldAccess(self.expression(depth - 1, type), field.name)
+        if choice < 0.85 and want in PRIMITIVES:
+            if want is Type.boolean:
+                operator = rng.choice(OPERATORS[5:])
+                operand_type = Type.boolean if operator in ("&&", "||", "==", "!=") else Type.int
+            else:
+                operator = rng.choice(OPERATORS[:5])
+                operand_type = want
+            return BinaryOperation(
+                self.expression(depth - 1, operand_type),
+                operator,
+                self.expression(depth - 1, operand_type))
+        if choice < 0.95 and want is not Type.void:
+            if want.is_primitive:
+                source_type = Type.boolean if want is Type.boolean else rng.choice([Type.int, Type.double])
+            else:
+                source_type = want
+            return Cast(want, self.expression(depth - 1, source_type))
+        return self._leaf(want)
+
+    def _leaf(self, want):
+        rng = self.rng
+        if not want.is_primitive and rng.random() < self.null_rate:
+            return NullLiteral()
+        if self.holes:
+            self._hole_count += 1
+            return Hole("h" + str(self._hole_count), want)
+        if want.is_primitive and want is not Type.void:
+            return Literal(str(rng.randrange(100)), want)
+        return Variable("v" + str(rng.randrange(1000)), want)
+
+    def _any_type(self):
+        return self.rng.choice(self.types + PRIMITIVES)
+
+    def _methods(self, type):
+        seen = {}
+        for ancestor in [type] + [t for t in self.types if reference.is_subtype(type, t)]:
+            for method in getattr(ancestor, "methods", {}).values():
+                seen.setdefault(method.name, method)
+        return seen.values()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+A deliberately simple reference implementation of the type checker’s rules, written straight from
+the Java semantics with no caching, freezing, or shared helpers, for differential testing of the
+optimized code paths. Walks supertypes iteratively so that deep hierarchies do not overflow the
+stack.
+"""
+
+from java_type_checker import *
+
+
+WIDENINGS = {
+    ("boolean", "boolean"), ("int", "int"), ("int", "double"), ("double", "double"),
+}
+NUMERIC = {"int", "double"}
+
+
+def is_primitive(type):
+    return type.name in ("void", "boolean", "int", "double")
+
+
+def is_subtype(a, b):
+    if a is Type.null:
+        return True
+    seen = set()
+    pending = [a]
+    while pending:
+        type = pending.pop()
+        if type is b:
+            return True
+        if type not in seen:
+            seen.add(type)
+            pending.extend(type.direct_supertypes)
+    return False
+
+
+def is_assignable(a, b):
+    if is_primitive(a) or is_primitive(b):
+        return (a.name, b.name) in WIDENINGS
+    return is_subtype(a, b)
+
+
+def find_member(type, table_name, name):
+    """ Own members first, then each supertype’s, depth first in declaration order.
+        """
+    seen = set()
+    pending = [type]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        table = getattr(current, table_name, {})
+        if name in table:
+            return table[name]
+        pending.extend(reversed(current.direct_supertypes))
+    return None
+
+
+def lookup_method(type, name):
+    if type is Type.null:
+        raise NoSuchMethod("Cannot invoke method {0}() on null".format(name))
+    method = find_member(type, "methods", name)
+    if method is None:
+        raise NoSuchMethod("{0} has no method named {1}".format(type.name, name))
+    return method
+
+
+def lookup_field(type, name):
+    if type is Type.null:
+        raise NoSuchField("Cannot access field {0} on null".format(name))
+    field = find_member(type, "fields", name)
+    if field is None:
+        raise NoSuchField("{0} has no field named {1}".format(type.name, name))
+    return field
+
+
+def check_call(call_name, expected, args, fillers):
+    if len(expected) != len(args):
+        raise JavaTypeError("Wrong number of arguments for {0}: expected {1}, got {2}".format(
+            call_name, len(expected), len(args)))
+    actual = [check(arg, fillers) for arg in args]
+    if not all(is_assignable(a, e) for a, e in zip(actual, expected)):
+        raise JavaTypeError("{0} expects arguments of type {1}, but got {2}".format(
+            call_name, names(expected), names(actual)))
+
+
+def binary_type(operator, left, right):
+    numeric = left.name in NUMERIC and right.name in NUMERIC
+    both_boolean = left is Type.boolean and right is Type.boolean
+    result = None
+    if operator in ("+", "-", "*", "/", "%") and numeric:
+        result = Type.double if Type.double in (left, right) else Type.int
+    elif operator in ("<", "<=", ">", ">=") and numeric:
+        result = Type.boolean
+    elif operator in ("&&", "||") and both_boolean:
+        result = Type.boolean
+    elif operator in ("==", "!="):
+        if numeric or both_boolean:
+            result = Type.boolean
+        elif not is_primitive(left) and not is_primitive(right) \
+                and (is_subtype(left, right) or is_subtype(right, left)):
+            result = Type.boolean
+    elif operator not in ("+", "-", "*", "/", "%", "<", "<=", ">", ">=", "&&", "||"):
+        raise JavaTypeError("Unknown operator {0}".format(operator))
+    if result is None:
+        raise JavaTypeError("Operator {0} cannot be applied to {1}".format(operator, names([left, right])))
+    return result
+
+
+def check(expr, fillers={}):
+    """ Returns the static type of expr, raising the same errors as Expression.check_types().
+        Holes named in fillers check as their filler expression, as in CheckingPlan.check().
+        """
+    if isinstance(expr, Hole):
+        return check(fillers[expr.name]) if expr.name in fillers else expr.type
+    if isinstance(expr, Variable):
+        if expr.declared_type is None:
+            raise NoSuchVariable("Cannot find variable {0}".format(expr.name))
+        return expr.declared_type
+    if isinstance(expr, Literal):
+        return expr.type
+    if isinstance(expr, MethodCall):
+        receiver = check(expr.receiver, fillers)
+        if is_primitive(receiver):
+            raise JavaTypeError("Type {0} does not have methods".format(receiver.name))
+        method = lookup_method(receiver, expr.method_name)
+        check_call(receiver.name + "." + expr.method_name + "()", method.argument_types, expr.args, fillers)
+        return method.return_type
+    if isinstance(expr, ConstructorCall):
+        type = expr.instantiated_type
+        if is_primitive(type) or type is Type.null:
+            raise JavaTypeError("Type {0} is not instantiable".format(type.name))
+        check_call(type.name + " constructor", type.constructor.argument_types, expr.args, fillers)
+        return type
+    if isinstance(expr, FieldAccess):
+        receiver = check(expr.receiver, fillers)
+        if is_primitive(receiver):
+            raise JavaTypeError("Type {0} does not have fields".format(receiver.name))
+        return lookup_field(receiver, expr.field_name).type
+    if isinstance(expr, BinaryOperation):
+        left = check(expr.left, fillers)
+        return binary_type(expr.operator, left, check(expr.right, fillers))
+    if isinstance(expr, Cast):
+        source, target = check(expr.expression, fillers), expr.target_type
+        if is_primitive(source) or is_primitive(target):
+            allowed = (source.name in NUMERIC and target.name in NUMERIC) or (source is target is Type.boolean)
+        else:
+            allowed = is_subtype(source, target) or is_subtype(target, source)
+        if not allowed:
+            raise JavaTypeError("Cannot cast {0} to {1}".format(source.name, target.name))
+        return target
+    raise ValueError("Unknown expression {0}".format(expr))
+
+
+def outcome(check_function, *args):
+    """ Runs a checker and describes what happened, so different checkers can be compared:
+        either ("ok", static type) or (error class name, message).
+        """
+    try:
+        return ("ok", check_function(*args))
+    except (JavaTypeError, NoSuchMethod, NoSuchField, NoSuchVariable) as error:
+        return (type(error).__name__, str(error))
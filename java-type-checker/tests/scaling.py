@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+Records how the checker’s running time scales with hierarchy depth and expression size:
+
+    python3 -m tests.scaling [--depths 10,100,1000] [--tree-depths 2,4,6,8] [--output results.csv]
+
+Times are the best of several runs, in microseconds per operation. The reference column is the
+simple implementation in tests/reference.py, for comparison with the optimized code paths.
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+import timeit
+
+from java_type_checker import *
+from tests import reference
+from tests.generators import random_hierarchy, ExpressionGenerator
+
+
+def main(argv=None, out=sys.stdout):
+    parser = argparse.ArgumentParser(prog="python3 -m tests.scaling")
+    parser.add_argument("--depths", default="10,100,1000,3000",
+        help="hierarchy depths to measure (comma separated)")
+    parser.add_argument("--tree-depths", default="2,4,6,8",
+        help="expression tree depths to measure (comma separated)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results to this CSV file")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for depth in _numbers(args.depths):
+        rows.append(measure_hierarchy(random.Random(args.seed), depth))
+    for tree_depth in _numbers(args.tree_depths):
+        rows.append(measure_expressions(random.Random(args.seed), tree_depth))
+
+    columns = []
+    for row in rows:
+        columns.extend(name for name in row if name not in columns)
+    _print_table(columns, rows, out)
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            writer = csv.DictWriter(file, columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def measure_hierarchy(rng, depth):
+    """ Times lookups from the bottom of a hierarchy `depth` types deep to the top of it.
+        """
+    types = random_hierarchy(rng, depth, max_interfaces=0, chain=True)
+    top, bottom = types[0], types[-1]
+    overridden = {name for type in types[1:] for name in type.methods}
+    inherited = next(
+        (method for method in top.methods.values() if method.name not in overridden),
+        Type.object.method_named("hashCode"))
+    call = MethodCall(ConstructorCall(bottom, *[
+        Variable("x", type) for type in bottom.constructor.argument_types]),
+        inherited.name, *[Variable("x", type) for type in inherited.argument_types])
+
+    start = time.perf_counter()
+    universe = TypeUniverse(types)
+    universe.freeze()
+    build_time = time.perf_counter() - start
+
+    return {
+        "case": "hierarchy depth {0}".format(depth),
+        "build+freeze ms": build_time * 1000,
+        "subtype µs": _time(lambda: bottom.is_subtype_of(top)),
+        "reference subtype µs": _time(lambda: reference.is_subtype(bottom, top)),
+        "method lookup µs": _time(lambda: bottom.method_named(inherited.name)),
+        "reference lookup µs": _time(lambda: reference.find_member(bottom, "methods", inherited.name)),
+        "check µs": _time(call.check_types),
+        "reference check µs": _time(lambda: reference.check(call)),
+    }
+
+
+def measure_expressions(rng, tree_depth):
+    """ Times checking well-typed expressions about `tree_depth` levels deep.
+        """
+    types = random_hierarchy(rng, 100)
+    TypeUniverse(types).freeze()
+    generator = ExpressionGenerator(rng, types, error_rate=0, null_rate=0, holes=True)
+    template = max((generator.expression(tree_depth) for i in range(20)), key=_count_nodes)
+    plan = CheckingPlan(template)
+    hole_types = [hole.type for hole in plan.holes]
+
+    return {
+        "case": "tree depth {0}".format(tree_depth),
+        "nodes": _count_nodes(template),
+        "check µs": _time(template.check_types),
+        "reference check µs": _time(lambda: reference.check(template)),
+        "plan compile µs": _time(lambda: CheckingPlan(template)),
+        "plan check µs": _time(lambda: plan.check_hole_types(hole_types)),
+    }
+
+
+def _time(function):
+    """ Best time of several runs of function, in microseconds per call.
+        """
+    timer = timeit.Timer(function)
+    number, total = timer.autorange()
+    return min([total] + timer.repeat(repeat=2, number=number)) / number * 1e6
+
+
+def _count_nodes(node):
+    children = []
+    for name in ("receiver", "left", "right", "expression"):
+        if isinstance(getattr(node, name, None), Expression):
+            children.append(getattr(node, name))
+    children.extend(getattr(node, "args", ()))
+    return 1 + sum(_count_nodes(child) for child in children)
+
+
+def _numbers(text):
+    return [int(part) for part in text.split(",") if part]
+
+
+def _print_table(columns, rows, out):
+    cells = [columns] + [[_format(row.get(column, "")) for column in columns] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+    for row in cells:
+        print("  ".join(cell.rjust(width) if i else cell.ljust(width)
+                        for i, (cell, width) in enumerate(zip(row, widths))), file=out)
+
+
+def _format(value):
+    return "{0:.2f}".format(value) if isinstance(value, float) else str(value)
+
+
+if __name__ == "__main__":
+    main()
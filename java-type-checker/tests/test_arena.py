@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests import reference
+from tests.fixtures import Graphics
+from tests.generators import random_hierarchy, ExpressionGenerator
+import random
+import unittest
+
+
+class TestExpressionArena(unittest.TestCase):
+
+    def setUp(self):
+        self.arena = ExpressionArena()
+
+    def test_checks_nested_calls(self):
+        """
+        Equivalent Java:
+
+            GraphicsGroup group;
+            Window window;
+
+            group.add(new Rectangle(new Point(0.0, 1), window.getSize()))
+        """
+        a = self.arena
+        root = a.method_call(
+            a.variable("group", Graphics.graphics_group),
+            "add",
+            a.constructor_call(
+                Graphics.rectangle,
+                a.constructor_call(Graphics.point,
+                    a.literal("0.0", Type.double),
+                    a.literal("1", Type.int)),
+                a.method_call(
+                    a.variable("window", Graphics.window),
+                    "getSize")))
+        self.assertEqual(Type.void, a.check_types(root))
+        self.assertEqual(len(a) - 1, root)
+        self.assertEqual(2, a.child_count[root])
+        self.assertEqual(Type.void, a.check_all()[root])
+
+    def test_reports_same_error_as_tree(self):
+        """
+        Equivalent Java:
+
+            Point p;
+
+            new Point(p.getX() + null.x, p.getY())
+        """
+        a = self.arena
+        point = a.variable("p", Graphics.point)
+        root = a.constructor_call(Graphics.point,
+            a.binary_operation(
+                a.method_call(point, "getX"),
+                "+",
+                a.field_access(a.null_literal(), "x")),
+            a.method_call(point, "getY"))
+        with self.assertRaisesRegex(NoSuchField, "Cannot access field x on null"):
+            a.check_types(root)
+
+    def test_looks_up_undeclared_variables_in_scope(self):
+        root = self.arena.method_call(self.arena.variable("p"), "getY")
+        self.assertEqual(Type.double, self.arena.check_types(root, Scope.empty.declare("p", Graphics.point)))
+        with self.assertRaisesRegex(NoSuchVariable, "Cannot find variable p"):
+            self.arena.check_types(root)
+
+    def test_shares_types_and_names(self):
+        for i in range(100):
+            self.arena.cast(Type.double, self.arena.literal("1", Type.int))
+        self.assertEqual(200, len(self.arena))
+        self.assertEqual([Type.int, Type.double], self.arena.types)
+        self.assertEqual(["1"], self.arena.names)
+
+    def test_checks_expressions_too_deep_for_recursion(self):
+        node = self.arena.literal("1", Type.int)
+        for i in range(10000):
+            node = self.arena.binary_operation(node, "+", self.arena.literal("2.0", Type.double))
+        self.assertEqual(Type.double, self.arena.check_types(node))
+
+    def test_rejects_children_that_are_not_built_yet(self):
+        with self.assertRaisesRegex(ValueError, "Node 0 does not exist in this arena"):
+            self.arena.field_access(0, "x")
+
+    def test_checks_constructor_calls_without_arguments(self):
+        root = self.arena.constructor_call(Graphics.point)
+        with self.assertRaisesRegex(JavaTypeError, "Wrong number of arguments for Point constructor"):
+            self.arena.check_types(root)
+        self.assertIsInstance(self.arena.check_all()[root], JavaTypeError)
+
+    def test_repeated_expressions_share_verdicts(self):
+        """
+        Equivalent Java, once for each i:
+
+            new Point(i, p.getX() + i).getX()
+        """
+        a = self.arena
+        scope = Scope.empty.declare("p", Graphics.point)
+        roots = []
+        for i in range(200):
+            roots.append(a.method_call(
+                a.constructor_call(Graphics.point,
+                    a.literal(str(i), Type.int),
+                    a.binary_operation(
+                        a.method_call(a.variable("p"), "getX"),
+                        "+",
+                        a.literal(str(i), Type.int))),
+                "getX"))
+        verdicts = a.check_all(scope)
+        self.assertEqual([Type.double] * 200, [verdicts[root] for root in roots])
+        self.assertEqual(Type.double, a.check_types(roots[100], scope))
+        with self.assertRaisesRegex(NoSuchVariable, "Cannot find variable p"):
+            a.check_types(roots[100])
+
+    def test_rejects_nodes_that_do_not_exist(self):
+        self.arena.literal("1", Type.int)
+        with self.assertRaisesRegex(ValueError, "Node 1 does not exist in this arena"):
+            self.arena.check_types(1)
+
+    def test_stores_expression_subclasses_as_their_base_kind(self):
+        root = self.arena.add_expression(
+            BinaryOperation(Variable("p", Graphics.point), "==", NullLiteral()))
+        self.assertEqual(Type.boolean, self.arena.check_types(root))
+        with self.assertRaisesRegex(ValueError, "Cannot store Hole in an arena"):
+            self.arena.add_expression(Hole("h", Type.int))
+
+    def test_checks_like_expression_trees(self):
+        for seed in range(6):
+            rng = random.Random(seed)
+            types = random_hierarchy(rng, 30)
+            TypeUniverse(types).freeze()
+            generator = ExpressionGenerator(rng, types, error_rate=0.05)
+            expressions = [generator.expression(rng.randint(0, 4)) for i in range(100)]
+            roots = [self.arena.add_expression(expression) for expression in expressions]
+
+            verdicts = self.arena.check_all()
+            with self.subTest(seed=seed):
+                self.assertEqual(
+                    [reference.outcome(expression.check_types) for expression in expressions],
+                    [self.outcome(verdicts[root]) for root in roots])
+                self.assertEqual(
+                    [reference.outcome(expression.check_types) for expression in expressions],
+                    [reference.outcome(self.arena.check_types, root) for root in roots])
+
+    # ––– Helpers –––
+
+    def outcome(self, verdict):
+        if isinstance(verdict, Exception):
+            return (type(verdict).__name__, str(verdict))
+        return ("ok", verdict)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import threading
+import unittest
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LRUCache(max_size=3)
+        for key in "abc":
+            self.cache[key] = key.upper()
+
+    def test_evicts_least_recently_used_entry(self):
+        self.assertEqual("A", self.cache["a"])  # Now b is the oldest
+        self.cache["d"] = "D"
+        self.assertEqual(["a", "c", "d"], sorted(key for key in "abcd" if key in self.cache))
+        self.assertEqual(3, len(self.cache))
+        self.assertEqual(1, self.cache.evictions)
+
+    def test_counts_hits_and_misses(self):
+        self.assertEqual("B", self.cache.get("b"))
+        self.assertIsNone(self.cache.get("z"))
+        with self.assertRaises(KeyError):
+            self.cache["z"]
+        self.assertEqual(CacheStats(size=3, max_size=3, hits=1, misses=2, evictions=0), self.cache.stats())
+
+    def test_clear_keeps_counters(self):
+        self.cache.get("a")
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+        self.assertNotIn("a", self.cache)
+        self.assertEqual(CacheStats(size=0, max_size=3, hits=1, misses=0, evictions=0), self.cache.stats())
+
+    def test_rejects_empty_size_limit(self):
+        with self.assertRaisesRegex(ValueError, "Cache size must be at least 1, not 0"):
+            LRUCache(max_size=0)
+
+    def test_stays_within_size_limit_when_shared_by_threads(self):
+        cache = LRUCache(max_size=50)
+
+        def fill(offset):
+            for i in range(2000):
+                cache[offset + i % 100] = i
+                cache.get(offset + (i * 7) % 100)
+
+        threads = [threading.Thread(target=fill, args=(1000 * n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertEqual(50, stats.size)
+        self.assertEqual(8 * 2000, stats.hits + stats.misses)
+
+
+class TestCacheGroup(unittest.TestCase):
+
+    def test_universe_caches_are_cleared_together(self):
+        universe = TypeUniverse(Graphics.all_types)
+        plans = universe.caches.cache("plans", max_size=10)
+        verdicts = universe.caches.cache("verdicts")
+        self.assertIs(plans, universe.caches.cache("plans"))
+        self.assertEqual(10, plans.max_size)
+        self.assertEqual(universe.caches.default_max_size, verdicts.max_size)
+
+        plans["a"] = 1
+        verdicts["b"] = 2
+        universe.caches.clear()
+        self.assertEqual(
+            {"plans": CacheStats(0, 10, 0, 0, 0), "verdicts": CacheStats(0, 1024, 0, 0, 0)},
+            universe.caches.stats())
+        self.assertEqual(0, len(TypeUniverse().caches))
+
+    def test_rejects_conflicting_size_limits(self):
+        caches = CacheGroup()
+        caches.cache("plans", max_size=10)
+        self.assertEqual(10, caches.cache("plans", max_size=10).max_size)
+        with self.assertRaisesRegex(ValueError, "Cache plans already exists with size limit 10, not 20"):
+            caches.cache("plans", max_size=20)
+
+    def test_checking_plans_share_their_group_verdict_cache(self):
+        universe = TypeUniverse(Graphics.all_types)
+        get_x = CheckingPlan(MethodCall(Hole("point", Graphics.point), "getX"), caches=universe.caches)
+        get_y = CheckingPlan(MethodCall(Hole("point", Graphics.point), "getY"), caches=universe.caches)
+        self.assertIs(get_x.verdicts, get_y.verdicts)
+        for i in range(3):
+            get_x.check_hole_types([Graphics.point])
+            get_y.check_hole_types([Graphics.point])
+        self.assertEqual(CacheStats(size=2, max_size=1024, hits=4, misses=2, evictions=0),
+                         universe.caches.stats()["verdicts"])
+        self.assertEqual((2, 1), (get_x.hits, get_x.misses))
+
+        universe.caches.clear()
+        self.assertEqual(Type.double, get_y.check_hole_types([Graphics.point]))
+        self.assertEqual((2, 2), (get_y.hits, get_y.misses))
+
+    def test_checking_plan_remembers_recent_verdicts_only(self):
+        """
+        Template:
+
+            «point».getX()
+        """
+        plan = CheckingPlan(MethodCall(Hole("point", Graphics.point), "getX"), max_verdicts=2)
+        for type in [Graphics.point, Graphics.graphics_object, Type.null, Graphics.point]:
+            try:
+                plan.check_hole_types([type])
+            except NoSuchMethod:
+                pass
+        self.assertEqual(CacheStats(size=2, max_size=2, hits=0, misses=4, evictions=2), plan.verdicts.stats())
+        self.assertEqual(Type.double, plan.check_hole_types([Graphics.point]))
+        self.assertEqual((1, 4), (plan.hits, plan.misses))
+
+
+if __name__ == '__main__':
+    unittest.main()
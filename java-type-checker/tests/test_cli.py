@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import load_universe, load_expression
+from java_type_checker.cli import main, _read_chunks
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+UNIVERSE = {"types": [
+    {"name": "Point",
+     "constructor": ["double", "double"],
+     "methods": [
+         {"name": "getX", "returns": "double"},
+         {"name": "distanceTo", "arguments": ["Point"], "returns": "double"}],
+     "fields": [{"name": "x", "type": "double"}]},
+    {"name": "Point3D",
+     "supertypes": ["Point"],
+     "methods": [{"name": "getZ", "returns": "double"}]},
+]}
+
+
+def distance_call(i, argument_type):
+    return {"call": "distanceTo",
+            "receiver": {"variable": "p" + str(i), "type": "Point3D"},
+            "args": [{"variable": "q" + str(i), "type": argument_type}]}
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.universe_path = self.write("universe.json", [json.dumps(UNIVERSE)])
+        self.good_path = self.write("good.jsonl", [
+            json.dumps(distance_call(i, "Point3D")) for i in range(300)])
+        self.bad_path = self.write("bad.jsonl", [
+            json.dumps(distance_call(0, "Point")),
+            json.dumps(distance_call(1, "double")),
+            json.dumps({"new": "Point", "args": [{"literal": "1", "type": "int"}]}),
+            "",
+            json.dumps({"operator": "+", "left": {"field": "x", "receiver": {"null": True}},
+                        "right": {"literal": "1", "type": "int"}}),
+            "{not json",
+            json.dumps({"cast": "Unknown", "expression": {"null": True}}),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_checks_files_in_this_process(self):
+        status, output = self.run_main("--jobs", "1", self.good_path, self.bad_path)
+        self.assertEqual(1, status)
+        self.assertEqual([
+            self.bad_path + ":2: JavaTypeError: Point3D.distanceTo() expects arguments of type (Point), but got (double)",
+            self.bad_path + ":3: JavaTypeError: Wrong number of arguments for Point constructor: expected 2, got 1",
+            self.bad_path + ":5: NoSuchField: Cannot access field x on null",
+            self.bad_path + ":7: InvalidInput: Unknown type Unknown",
+        ], [output[0], output[1], output[2], output[4]])
+        self.assertTrue(output[3].startswith(self.bad_path + ":6: InvalidInput: Expecting property name"))
+        self.assertIn("Checked 306 expressions in 2 files: 5 with errors", output)
+        self.assertIn("Template cache: 99.0% hit rate (3 plans built for 306 expressions, 0 evicted)", output)
+
+    def test_evicts_least_recently_used_plans(self):
+        status, output = self.run_main("--jobs", "1", "--max-templates", "1", self.bad_path, self.good_path)
+        self.assertIn("Template cache: 98.7% hit rate (4 plans built for 306 expressions, 3 evicted)", output)
+
+    def test_checks_files_in_parallel(self):
+        status, output = self.run_main("--jobs", "2", "--chunk-size", "50", self.good_path)
+        self.assertEqual(0, status)
+        self.assertEqual("Checked 300 expressions in 1 files: 0 with errors", output[0])
+        self.assertTrue(output[1].startswith("Time: "))
+        self.assertTrue(output[1].endswith(" expressions/sec)"))
+        self.assertTrue(output[-1].startswith("Peak memory: "))
+
+    def test_rejects_unusable_universe_before_checking(self):
+        cycle = self.write("cycle.json", [json.dumps({"types": [
+            {"name": "A", "supertypes": ["B"]},
+            {"name": "B", "supertypes": ["A"]}]})])
+        unknown = self.write("unknown.json", [json.dumps({"types": [
+            {"name": "A", "supertypes": ["Missing"]}]})])
+        for jobs in ["1", "2"]:
+            status, output, errors = self.run_main_with_errors("--universe", cycle, "--jobs", jobs, self.good_path)
+            self.assertEqual((2, []), (status, output))
+            self.assertEqual(1, len(errors))
+            self.assertTrue(errors[0].startswith("python3 -m java_type_checker: error: Inheritance cycle"))
+
+            status, output, errors = self.run_main_with_errors("--universe", unknown, "--jobs", jobs, self.good_path)
+            self.assertEqual((2, [], ["python3 -m java_type_checker: error: Unknown type Missing"]), (status, output, errors))
+
+    def test_rejects_universe_files_of_the_wrong_shape(self):
+        for name, data, message in [
+                ("array.json", [], "Type universe must be a JSON object, not []"),
+                ("null.json", None, "Type universe must be a JSON object, not null"),
+                ("types.json", {"types": {}}, "Type universe types must be a JSON array, not {}"),
+                ("type.json", {"types": ["A"]}, 'Type declaration must be a JSON object, not "A"'),
+                ("method.json", {"types": [{"name": "A", "methods": [1]}]},
+                    "Method declaration must be a JSON object, not 1")]:
+            path = self.write(name, [json.dumps(data)])
+            status, output, errors = self.run_main_with_errors("--universe", path, self.good_path)
+            self.assertEqual(
+                (2, [], ["python3 -m java_type_checker: error: " + message]),
+                (status, output, errors))
+
+    def test_rejects_unusable_arguments(self):
+        missing = os.path.join(self.directory, "missing.jsonl")
+        self.assertEqual(
+            (2, [], ["python3 -m java_type_checker: error: Cannot read {0}: no such file".format(missing)]),
+            self.run_main_with_errors("--universe", self.universe_path, self.good_path, missing))
+        self.assertEqual(
+            (2, [], ["python3 -m java_type_checker: error: --chunk-size must be at least 1, not 0"]),
+            self.run_main_with_errors("--universe", self.universe_path, "--chunk-size", "0", self.good_path))
+        self.assertEqual(
+            (2, [], ["python3 -m java_type_checker: error: --max-verdicts must be at least 1, not -5"]),
+            self.run_main_with_errors("--universe", self.universe_path, "--max-verdicts", "-5", self.good_path))
+        status, output, errors = self.run_main_with_errors(
+            "--universe", os.path.join(self.directory, "nope.json"), self.good_path)
+        self.assertEqual(2, status)
+        self.assertEqual(1, len(errors))
+
+    def test_rejects_expressions_that_are_not_objects(self):
+        path = self.write("shapes.jsonl", [
+            json.dumps("null"),
+            json.dumps(["null"]),
+            json.dumps({"field": "x", "receiver": "null"}),
+        ])
+        status, output = self.run_main("--jobs", "1", path)
+        self.assertEqual(1, status)
+        self.assertEqual([
+            path + ':1: InvalidInput: Expression must be a JSON object, not "null"',
+            path + ':2: InvalidInput: Expression must be a JSON object, not ["null"]',
+            path + ':3: InvalidInput: Expression must be a JSON object, not "null"',
+        ], output[:3])
+        with self.assertRaisesRegex(ValueError, "Expression must be a JSON object"):
+            load_expression(["null"], load_universe(UNIVERSE))
+
+    def test_reports_deeply_nested_lines_without_stopping(self):
+        # Built as text, since json.dumps() cannot nest this deeply either
+        point = '{"variable": "p", "type": "Point"}'
+        cast = '{"cast": "Point", "expression": ' * 1200 + point + "}" * 1200
+        call = '{"call": "distanceTo", "receiver": ' * 600 + point + (', "args": [' + point + "]}") * 600
+        path = self.write("deep.jsonl", [cast, call])
+        for jobs in ["1", "2"]:
+            status, output = self.run_main("--jobs", jobs, path, self.good_path)
+            self.assertEqual(1, status)
+            self.assertEqual([
+                path + ":1: InvalidInput: Expression is nested too deeply",
+                path + ":2: JavaTypeError: Type double does not have methods",
+            ], sorted(line for line in output if line.startswith(path)))
+            self.assertIn("Checked 302 expressions in 2 files: 2 with errors", output)
+
+    def test_reads_files_a_chunk_at_a_time(self):
+        chunks = _read_chunks([self.good_path, self.bad_path], 128)
+        self.assertEqual((self.good_path, 1), next(chunks)[:2])
+        self.assertEqual(
+            [(self.good_path, 129, 128), (self.good_path, 257, 44), (self.bad_path, 1, 7)],
+            [(path, first, len(lines)) for path, first, lines in chunks])
+
+    def test_runs_as_module(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "java_type_checker", "--universe", self.universe_path, self.good_path],
+            cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
+            stdout=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(0, result.returncode)
+        self.assertIn("Checked 300 expressions in 1 files: 0 with errors", result.stdout)
+
+    # ––– Helpers –––
+
+    def write(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        return path
+
+    def run_main(self, *args):
+        out = io.StringIO()
+        status = main(["--universe", self.universe_path] + list(args), out=out)
+        return status, out.getvalue().splitlines()
+
+    def run_main_with_errors(self, *args):
+        out, err = io.StringIO(), io.StringIO()
+        status = main(list(args), out=out, err=err)
+        return status, out.getvalue().splitlines(), err.getvalue().splitlines()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests import reference
+from tests.generators import random_hierarchy, ExpressionGenerator, PRIMITIVES
+import random
+import unittest
+
+
+class TestDifferential(unittest.TestCase):
+    """
+        Checks the optimized code paths (frozen lookup tables, CheckingPlans) against the simple
+        reference implementation in tests/reference.py, on random hierarchies and expressions.
+        Each case names its seed so a failure can be replayed.
+        """
+
+    seeds = range(8)
+
+    def test_lookups_match_reference(self):
+        for seed in self.seeds:
+            rng = random.Random(seed)
+            types = [Type.object] + random_hierarchy(rng, 30)
+            expected_subtypes = [[reference.is_subtype(a, b) for b in types] for a in types]
+            expected_members = [self.lookup_all(reference.find_member, t) for t in types]
+
+            for frozen in (False, True):
+                if frozen:
+                    TypeUniverse(types[1:]).freeze()
+                with self.subTest(seed=seed, frozen=frozen):
+                    self.assertEqual(expected_subtypes, [[a.is_subtype_of(b) for b in types] for a in types])
+                    self.assertEqual(expected_members, [self.lookup_all(self.find_member, t) for t in types])
+
+    def test_tree_checker_matches_reference(self):
+        for seed in self.seeds:
+            rng = random.Random(seed)
+            types = random_hierarchy(rng, 40)
+            expressions = self.expressions(rng, types, count=150)
+            expected = [reference.outcome(reference.check, e) for e in expressions]
+            self.assertMixOfOutcomes(expected)
+
+            for frozen in (False, True):
+                if frozen:
+                    TypeUniverse(types).freeze()
+                with self.subTest(seed=seed, frozen=frozen):
+                    self.assertEqual(expected, [reference.outcome(e.check_types) for e in expressions])
+
+    def test_checking_plans_match_reference(self):
+        for seed in self.seeds:
+            rng = random.Random(seed)
+            types = random_hierarchy(rng, 40)
+            TypeUniverse(types).freeze()
+            generator = ExpressionGenerator(rng, types, error_rate=0.05, holes=True)
+            choices = generator.types + PRIMITIVES + [Type.null]
+            for i in range(60):
+                template = generator.expression(rng.randint(0, 4))
+                plan = CheckingPlan(template)
+                with self.subTest(seed=seed, template=i):
+                    self.assertEqual(
+                        reference.outcome(reference.check, template),
+                        reference.outcome(plan.check))
+                    for j in range(5):
+                        fillers = {hole.name: self.filler(rng, hole, choices) for hole in plan.holes}
+                        self.assertEqual(
+                            reference.outcome(reference.check, template, fillers),
+                            reference.outcome(plan.check, fillers))
+
+    def test_deep_hierarchies_match_reference(self):
+        rng = random.Random(0)
+        types = random_hierarchy(rng, 2000, chain=True)
+        TypeUniverse(types).freeze()
+        generator = ExpressionGenerator(rng, types[-15:], error_rate=0.1)
+        for type in [types[0], types[999], types[-1]]:
+            self.assertTrue(types[-1].is_subtype_of(type))
+            self.assertFalse(type.is_subtype_of(types[-1]) and type is not types[-1])
+            self.assertEqual(
+                self.lookup_all(reference.find_member, type),
+                self.lookup_all(self.find_member, type))
+        for i in range(100):
+            expression = generator.expression(3)
+            self.assertEqual(
+                reference.outcome(reference.check, expression),
+                reference.outcome(expression.check_types))
+
+    # ––– Helpers –––
+
+    def expressions(self, rng, types, count):
+        generator = ExpressionGenerator(rng, types, error_rate=0.05)
+        return [generator.expression(rng.randint(0, 4)) for i in range(count)]
+
+    def filler(self, rng, hole, choices):
+        """ A variable of the hole’s type or a random one, or sometimes a filler that fails to check.
+            """
+        choice = rng.random()
+        if choice < 0.1:
+            return Variable(hole.name)  # Undeclared
+        if choice < 0.2:
+            return MethodCall(Literal("1", Type.int), "nope")
+        return Variable(hole.name, rng.choice([hole.type, rng.choice(choices)]))
+
+    def lookup_all(self, find_member, type):
+        names = ["m" + str(i) for i in range(40)] + ["f" + str(i) for i in range(40)] + ["equals", "hashCode"]
+        return [
+            find_member(type, "methods" if name[0] != "f" else "fields", name)
+            for name in names]
+
+    def find_member(self, type, table_name, name):
+        try:
+            return type.method_named(name) if table_name == "methods" else type.field_named(name)
+        except (NoSuchMethod, NoSuchField):
+            return None
+
+    def assertMixOfOutcomes(self, outcomes):
+        passed = sum(1 for kind, detail in outcomes if kind == "ok")
+        self.assertGreater(passed, len(outcomes) // 4)
+        self.assertGreater(len(outcomes) - passed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
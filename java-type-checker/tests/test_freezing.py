@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+import threading
+import unittest
+
+
+def make_shapes():
+    """
+    Equivalent Java:
+
+        interface Named { int getId(); }
+        class Shape implements Named { double area; double getArea(); }
+        class Polygon extends Shape { int getSides(); }
+        class Square extends Polygon, Named { double getArea(); }
+    """
+    named = ClassOrInterface("Named",
+        direct_supertypes=[Type.object],
+        methods=[Method("getId", return_type=Type.int)])
+    shape = ClassOrInterface("Shape",
+        direct_supertypes=[named],
+        methods=[Method("getArea", return_type=Type.double)],
+        fields=[Field("area", Type.double)])
+    polygon = ClassOrInterface("Polygon",
+        direct_supertypes=[shape],
+        methods=[Method("getSides", return_type=Type.int)])
+    square = ClassOrInterface("Square",
+        direct_supertypes=[polygon, named],
+        constructor=Constructor([Type.double]),
+        methods=[Method("getArea", return_type=Type.double)])
+    return named, shape, polygon, square
+
+
+class TestFreezing(unittest.TestCase):
+
+    def setUp(self):
+        self.named, self.shape, self.polygon, self.square = make_shapes()
+        self.universe = TypeUniverse([self.named, self.shape, self.polygon, self.square])
+
+    def test_frozen_lookups_match_unfrozen_lookups(self):
+        types = list(self.universe)
+        expected_subtypes = [[a.is_subtype_of(b) for b in types] for a in types]
+        expected_methods = [self.lookup_all(t) for t in types]
+
+        self.universe.freeze()
+        self.assertTrue(all(t.is_frozen for t in types))
+        self.assertEqual(expected_subtypes, [[a.is_subtype_of(b) for b in types] for a in types])
+        self.assertEqual(expected_methods, [self.lookup_all(t) for t in types])
+
+    def test_subtyping_is_transitive(self):
+        self.assertTrue(self.square.is_subtype_of(self.named))
+        self.assertTrue(self.square.is_subtype_of(Type.object))
+        self.universe.freeze()
+        self.assertTrue(self.square.is_subtype_of(self.named))
+        self.assertTrue(self.square.is_subtype_of(Type.object))
+        self.assertFalse(self.shape.is_subtype_of(self.square))
+
+    def test_frozen_types_reject_changes(self):
+        self.universe.freeze()
+        with self.assertRaisesRegex(FrozenTypeError, "Cannot change direct_supertypes of frozen type Square"):
+            self.square.direct_supertypes = [Type.object]
+        with self.assertRaises(TypeError):
+            self.square.methods["getArea"] = Method("getArea", return_type=Type.int)
+        with self.assertRaises(AttributeError):
+            self.square.direct_supertypes.append(Type.object)
+        with self.assertRaisesRegex(FrozenTypeError, "Cannot add Extra to a frozen type universe"):
+            self.universe.add(ClassOrInterface("Extra"))
+
+    def test_frozen_declarations_reject_changes(self):
+        self.universe.freeze()
+        with self.assertRaisesRegex(FrozenTypeError, "Cannot change return_type of frozen method getArea"):
+            self.square.method_named("getArea").return_type = Type.int
+        with self.assertRaisesRegex(FrozenTypeError, "Cannot change argument_types of frozen constructor"):
+            self.square.constructor.argument_types = [Type.int]
+        with self.assertRaisesRegex(FrozenTypeError, "Cannot change type of frozen field area"):
+            self.square.field_named("area").type = Type.int
+        self.assertEqual(Type.double, MethodCall(Variable("s", self.square), "getArea").check_types())
+
+    def test_unfrozen_types_get_their_own_default_constructor(self):
+        extra = ClassOrInterface("Extra")
+        self.assertIsNot(Type.object.constructor, extra.constructor)
+        extra.constructor.argument_types = [Type.int]
+        self.assertEqual([Type.int], extra.constructor.argument_types)
+        self.assertEqual([], ClassOrInterface("Other").constructor.argument_types)
+
+    def test_freezing_a_type_freezes_its_supertypes(self):
+        self.polygon.freeze()
+        self.assertTrue(self.shape.is_frozen)
+        self.assertTrue(self.named.is_frozen)
+        self.assertFalse(self.square.is_frozen)
+
+    def test_builtin_types_are_frozen(self):
+        with self.assertRaises(FrozenTypeError):
+            Type.int.name = "long"
+
+    def test_invalid_universe_does_not_freeze(self):
+        loop = ClassOrInterface("Loop")
+        loop.direct_supertypes = [loop]
+        universe = TypeUniverse([loop])
+        with self.assertRaises(InvalidTypeModel):
+            universe.freeze()
+        self.assertFalse(loop.is_frozen)
+
+    def test_rejects_duplicate_names(self):
+        with self.assertRaisesRegex(ValueError, "already has a type named Shape"):
+            self.universe.add(ClassOrInterface("Shape"))
+
+    def test_frozen_universe_is_shared_by_threads(self):
+        self.universe.freeze()
+        expression = MethodCall(
+            ConstructorCall(self.square, Literal("1", Type.int)),
+            "getId")
+        failures = []
+
+        def check_repeatedly():
+            try:
+                for i in range(2000):
+                    self.assertEqual(Type.int, expression.check_types())
+                    self.assertTrue(self.square.is_subtype_of(self.shape))
+            except Exception as error:
+                failures.append(error)
+
+        threads = [threading.Thread(target=check_repeatedly) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], failures)
+
+    # ––– Helpers –––
+
+    def lookup_all(self, type):
+        found = {}
+        for name in ["getId", "getArea", "getSides", "hashCode", "equals", "missing"]:
+            try:
+                found[name] = type.method_named(name)
+            except (NoSuchMethod, AttributeError):
+                found[name] = None
+        return found
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+#: Generous enough for a slow CI machine, tight enough to catch eager imports creeping back in
+IMPORT_BUDGET_SECONDS = 0.05
+
+
+def run_fresh_python(code):
+    """ Runs code in a new interpreter, with the package importable, and returns its output lines.
+        """
+    return subprocess.check_output(
+        [sys.executable, "-c", "import sys; sys.path.insert(0, {0!r})\n".format(PACKAGE_ROOT) + code],
+        universal_newlines=True).split()
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_package_import_loads_no_submodules(self):
+        loaded = run_fresh_python(
+            "import java_type_checker\n"
+            "print(' '.join(m for m in sys.modules if m.startswith('java_type_checker.')))\n"
+            "print('asyncio' in sys.modules)")
+        self.assertEqual(["False"], loaded)
+
+    def test_names_load_only_their_own_submodules(self):
+        loaded = run_fresh_python(
+            "from java_type_checker import CheckingPlan\n"
+            "print(' '.join(sorted(m for m in sys.modules if m.startswith('java_type_checker.'))))")
+        self.assertIn("java_type_checker.plans", loaded)
+        self.assertNotIn("java_type_checker.service", loaded)
+        self.assertNotIn("java_type_checker.validation", loaded)
+
+    def test_package_import_is_within_budget(self):
+        timings = run_fresh_python(
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import java_type_checker\n"
+            "print(time.perf_counter() - start)")
+        self.assertLess(float(timings[0]), IMPORT_BUDGET_SECONDS)
+
+    def test_unknown_names_raise_attribute_error(self):
+        import java_type_checker
+        with self.assertRaises(AttributeError):
+            java_type_checker.NoSuchThing
+
+
+if __name__ == '__main__':
+    unittest.main()
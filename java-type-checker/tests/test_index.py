@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import time
+import unittest
+
+
+class TestTypeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TypeUniverse(Graphics.all_types).index
+
+    def test_finds_types_accepted_where_supertype_expected(self):
+        self.assertEqual({Graphics.paint, Graphics.color}, self.index.subtypes_of(Graphics.paint))
+        self.assertEqual(
+            {Graphics.graphics_object, Graphics.rectangle, Graphics.graphics_group},
+            self.index.subtypes_of(Graphics.graphics_object))
+        self.assertEqual(
+            set(Graphics.all_types) | {Type.object},
+            self.index.subtypes_of(Type.object))
+
+    def test_subtypes_of_unrelated_type_is_empty(self):
+        self.assertEqual(set(), self.index.subtypes_of(ClassOrInterface("Unknown")))
+
+    def test_finds_declaring_types(self):
+        self.assertEqual(
+            {Graphics.point, Graphics.graphics_object},
+            self.index.types_declaring("getX"))
+        self.assertEqual({Type.object}, self.index.types_declaring("hashCode"))
+        self.assertEqual(set(), self.index.types_declaring("getZ"))
+
+    def test_finds_methods_by_signature(self):
+        self.assertEqual(
+            ["setFillColor", "setStrokeColor"],
+            sorted(method.name for owner, method in
+                   self.index.methods_with_signature([Graphics.paint], Type.void)))
+        self.assertEqual(
+            [(Graphics.graphics_object, Graphics.graphics_object.methods["setPosition"])],
+            self.index.methods_with_signature([Type.double, Type.double], Type.void))
+
+    def test_updates_as_types_are_added(self):
+        universe = TypeUniverse(Graphics.all_types)
+        gradient = ClassOrInterface("Gradient",
+            direct_supertypes=[Graphics.paint],
+            methods=[Method("getX", return_type=Type.double)])
+        universe.add(gradient)
+        self.assertIn(gradient, universe.index.subtypes_of(Graphics.paint))
+        self.assertIn(gradient, universe.index.subtypes_of(Type.object))
+        self.assertIn(gradient, universe.index.types_declaring("getX"))
+
+    def test_queries_are_fast_on_large_libraries(self):
+        types = []
+        for i in range(2000):
+            supertypes = [types[i // 2]] if types else [Type.object]
+            types.append(ClassOrInterface("T" + str(i),
+                direct_supertypes=supertypes,
+                methods=[Method("get" + str(i % 50), return_type=Type.int)]))
+        index = TypeUniverse(types).index
+
+        start = time.perf_counter()
+        for i in range(1000):
+            index.subtypes_of(types[i])
+            index.types_declaring("get7")
+            index.methods_with_signature([], Type.int)
+        per_query = (time.perf_counter() - start) / 3000
+        self.assertLess(per_query, 0.001)
+        self.assertEqual(2000, len(index.subtypes_of(types[0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestFieldAccess(TypeTest):
+
+    def test_field_access_static_type_is_field_type(self):
+        # p.x → double
+        self.assertEqual(
+            Type.double,
+            FieldAccess(Variable("p", Graphics.point), "x").static_type())
+
+    def test_finds_field_from_supertype(self):
+        """
+        Equivalent Java:
+
+            Rectangle rect;
+
+            rect.position.y
+        """
+        self.assertNoCompileErrors(
+            FieldAccess(
+                FieldAccess(Variable("rect", Graphics.rectangle), "position"),
+                "y"))
+
+    def test_flags_nonexistent_field(self):
+        self.assertCompileError(
+            NoSuchField,
+            "Point has no field named z",
+            FieldAccess(Variable("p", Graphics.point), "z"))
+
+    def test_cannot_access_fields_on_primitives(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Type int does not have fields",
+            FieldAccess(Variable("x", Type.int), "x"))
+
+    def test_cannot_access_field_on_null(self):
+        self.assertCompileError(
+            NoSuchField,
+            "Cannot access field x on null",
+            FieldAccess(NullLiteral(), "x"))
+
+
+class TestBinaryOperations(TypeTest):
+
+    def test_arithmetic_promotes_to_double(self):
+        # p.x * 2 → double
+        self.assertEqual(
+            Type.double,
+            BinaryOperation(
+                FieldAccess(Variable("p", Graphics.point), "x"),
+                "*",
+                Literal("2", Type.int)).check_types())
+
+    def test_int_arithmetic_stays_int(self):
+        self.assertEqual(
+            Type.int,
+            BinaryOperation(Variable("i", Type.int), "%", Literal("2", Type.int)).static_type())
+
+    def test_comparison_is_boolean(self):
+        self.assertEqual(
+            Type.boolean,
+            BinaryOperation(Variable("i", Type.int), "<=", Literal("2.5", Type.double)).check_types())
+
+    def test_logical_operators_require_booleans(self):
+        self.assertNoCompileErrors(
+            BinaryOperation(Variable("a", Type.boolean), "&&", Variable("b", Type.boolean)))
+        self.assertCompileError(
+            JavaTypeError,
+            "Operator || cannot be applied to (boolean, int)",
+            BinaryOperation(Variable("a", Type.boolean), "||", Variable("i", Type.int)))
+
+    def test_flags_arithmetic_on_references(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Operator + cannot be applied to (Point, int)",
+            BinaryOperation(Variable("p", Graphics.point), "+", Literal("1", Type.int)))
+
+    def test_reference_equality_requires_related_types(self):
+        self.assertNoCompileErrors(
+            BinaryOperation(Variable("c", Graphics.color), "==", Variable("paint", Graphics.paint)))
+        self.assertNoCompileErrors(
+            BinaryOperation(Variable("p", Graphics.point), "!=", NullLiteral()))
+        self.assertCompileError(
+            JavaTypeError,
+            "Operator == cannot be applied to (Point, Size)",
+            BinaryOperation(Variable("p", Graphics.point), "==", Variable("s", Graphics.size)))
+
+    def test_flags_errors_in_operands(self):
+        self.assertCompileError(
+            NoSuchMethod,
+            "Point has no method named getZ",
+            BinaryOperation(
+                MethodCall(Variable("p", Graphics.point), "getZ"),
+                "+",
+                Literal("1", Type.int)))
+
+    def test_flags_unknown_operator(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Unknown operator <>",
+            BinaryOperation(Variable("i", Type.int), "<>", Variable("j", Type.int)))
+
+    def test_int_widens_to_double_argument(self):
+        """
+        Equivalent Java:
+
+            new Point(0, 1 + 2)
+        """
+        self.assertNoCompileErrors(
+            ConstructorCall(
+                Graphics.point,
+                Literal("0", Type.int),
+                BinaryOperation(Literal("1", Type.int), "+", Literal("2", Type.int))))
+
+
+class TestCasts(TypeTest):
+
+    def test_cast_static_type_is_target_type(self):
+        self.assertEqual(
+            Type.int,
+            Cast(Type.int, Variable("d", Type.double)).static_type())
+
+    def test_allows_downcast(self):
+        """
+        Equivalent Java:
+
+            GraphicsObject g;
+
+            ((Rectangle) g).setFillColor(null)
+        """
+        self.assertNoCompileErrors(
+            MethodCall(
+                Cast(Graphics.rectangle, Variable("g", Graphics.graphics_object)),
+                "setFillColor",
+                NullLiteral()))
+
+    def test_flags_cast_between_unrelated_types(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Cannot cast Point to Size",
+            Cast(Graphics.size, Variable("p", Graphics.point)))
+
+    def test_flags_cast_between_primitive_and_reference(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Cannot cast int to Point",
+            Cast(Graphics.point, Variable("i", Type.int)))
+        self.assertCompileError(
+            JavaTypeError,
+            "Cannot cast null to int",
+            Cast(Type.int, NullLiteral()))
+
+    def test_flags_cast_from_boolean_to_number(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Cannot cast boolean to double",
+            Cast(Type.double, Variable("b", Type.boolean)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+import re
+
+
+class TestCheckingPlans(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Template:
+
+            «group».add(
+                new Rectangle(
+                    new Point(«x», «y»),
+                    «window».getSize()))
+        """
+        self.template = MethodCall(
+            Hole("group", Graphics.graphics_group),
+            "add",
+            ConstructorCall(
+                Graphics.rectangle,
+                ConstructorCall(Graphics.point,
+                    Hole("x", Type.double),
+                    Hole("y", Type.double)),
+                MethodCall(
+                    Hole("window", Graphics.window),
+                    "getSize")))
+        self.plan = CheckingPlan(self.template)
+
+    def test_holes_are_listed_in_check_order(self):
+        self.assertEqual(
+            ["group", "x", "y", "window"],
+            [hole.name for hole in self.plan.holes])
+
+    def test_template_checks_like_an_expression(self):
+        self.assertEqual(Type.void, self.template.check_types())
+        self.assertEqual(Type.void, self.plan.check())
+
+    def test_checks_filled_in_instances(self):
+        for i in range(100):
+            self.assertEqual(
+                Type.void,
+                self.plan.check({
+                    "group": Variable("g" + str(i), Graphics.graphics_group),
+                    "x": Literal(str(i), Type.int),
+                    "y": Literal(str(i) + ".5", Type.double),
+                    "window": Variable("w" + str(i), Graphics.window),
+                }))
+
+    def test_reports_same_errors_as_tree_checker(self):
+        self.assert_same_error(
+            {"x": NullLiteral()},
+            JavaTypeError,
+            "Point constructor expects arguments of type (double, double), but got (null, double)")
+        self.assert_same_error(
+            {"window": Variable("w", Graphics.point)},
+            NoSuchMethod,
+            "Point has no method named getSize")
+        self.assert_same_error(
+            {"group": Variable("x", Type.int)},
+            JavaTypeError,
+            "Type int does not have methods")
+
+    def test_remembers_errors(self):
+        for i in range(3):
+            with self.assertRaisesRegex(JavaTypeError, "Type boolean does not have methods"):
+                self.plan.check_hole_types([Type.boolean, Type.double, Type.double, Graphics.window])
+
+    def test_reports_folded_errors_in_order(self):
+        plan = CheckingPlan(
+            MethodCall(
+                Hole("rect", Graphics.rectangle),
+                "setPosition",
+                Hole("x", Type.double),
+                MethodCall(Variable("p", Graphics.point), "getZ")))
+        with self.assertRaisesRegex(NoSuchMethod, "Point has no method named getZ"):
+            plan.check()
+        with self.assertRaisesRegex(JavaTypeError, "Type int does not have methods"):
+            plan.check_hole_types([Type.int, Type.double])
+
+    def test_checks_fillers_only_where_tree_checker_would(self):
+        template = BinaryOperation(
+            MethodCall(Hole("a", Graphics.point), "nope"),
+            "+",
+            Hole("b", Type.int))
+        plan = CheckingPlan(template)
+        with self.assertRaisesRegex(NoSuchMethod, "Point has no method named nope"):
+            plan.check({"b": Variable("undefined")})
+
+        template = BinaryOperation(Hole("a", Type.int), "+", Hole("b", Type.int))
+        plan = CheckingPlan(template)
+        with self.assertRaisesRegex(NoSuchVariable, "Cannot find variable undefined"):
+            plan.check({"a": Variable("p", Graphics.point), "b": Variable("undefined")})
+        self.assertEqual(0, len(plan.verdicts))
+
+    def test_supports_operators_casts_and_fields(self):
+        plan = CheckingPlan(
+            BinaryOperation(
+                FieldAccess(Cast(Graphics.point, Hole("obj", Type.object)), "x"),
+                "<",
+                Hole("limit", Type.int)))
+        self.assertEqual(Type.boolean, plan.check())
+        self.assertEqual(Type.boolean, plan.check_hole_types([Graphics.point, Type.double]))
+        with self.assertRaisesRegex(JavaTypeError, "Cannot cast Size to Point"):
+            plan.check_hole_types([Graphics.size, Type.int])
+
+    def test_rejects_wrong_number_of_hole_types(self):
+        with self.assertRaises(ValueError):
+            self.plan.check_hole_types([Graphics.graphics_group])
+
+    def test_compiles_templates_deeper_than_the_tree_checker_recurses(self):
+        node = ClassOrInterface("Node")
+        node.methods = {"me": Method("me", return_type=node)}
+        template = Hole("h", node)
+        for i in range(600):
+            template = MethodCall(template, "me")
+        self.assertEqual(node, template.check_types())
+        plan = CheckingPlan(template)
+        self.assertEqual(node, plan.check())
+        with self.assertRaisesRegex(JavaTypeError, "Type int does not have methods"):
+            plan.check_hole_types([Type.int])
+
+    def test_lists_holes_behind_failing_steps(self):
+        plan = CheckingPlan(
+            ConstructorCall(Graphics.point, Hole("x", Type.double)))
+        self.assertEqual(["x"], [hole.name for hole in plan.holes])
+        with self.assertRaisesRegex(JavaTypeError, "Wrong number of arguments for Point constructor"):
+            plan.check_hole_types([Type.double])
+
+    # ––– Helpers –––
+
+    def assert_same_error(self, fillers, error, message):
+        instance = CheckingPlan(self.template).check  # Fresh plan: nothing remembered yet
+        with self.assertRaisesRegex(error, re.escape(message)):
+            instance(fillers)
+        with self.assertRaisesRegex(error, re.escape(message)):
+            self.fill(self.template, fillers).check_types()
+
+    def fill(self, node, fillers):
+        if isinstance(node, Hole):
+            return fillers.get(node.name, Variable(node.name, node.type))
+        if isinstance(node, MethodCall):
+            return MethodCall(self.fill(node.receiver, fillers), node.method_name,
+                              *[self.fill(arg, fillers) for arg in node.args])
+        if isinstance(node, ConstructorCall):
+            return ConstructorCall(node.instantiated_type, *[self.fill(arg, fillers) for arg in node.args])
+        return node
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.service import CheckingService, Diagnostic, check_batch
+from tests.test_freezing import make_shapes
+import asyncio
+import unittest
+
+
+class TestCheckingService(unittest.TestCase):
+
+    def setUp(self):
+        # The service freezes its universe, so use types of our own rather than shared fixtures
+        self.named, self.shape, self.polygon, self.square = make_shapes()
+        self.universe = TypeUniverse([self.named, self.shape, self.polygon, self.square])
+
+    def test_checks_expressions(self):
+        async def run():
+            async with CheckingService(self.universe) as service:
+                return await service.check(
+                    MethodCall(Variable("s", self.square), "getArea"))
+
+        result = asyncio.run(run())
+        self.assertTrue(result.ok)
+        self.assertEqual(Type.double, result.static_type)
+        self.assertEqual([], result.diagnostics)
+
+    def test_reports_diagnostics(self):
+        async def run():
+            async with CheckingService(self.universe) as service:
+                return await service.check_all([
+                    MethodCall(Variable("s", self.square), "getZ"),
+                    ConstructorCall(Type.int),
+                    MethodCall(Variable("p"), "getX"),
+                ])
+
+        results = asyncio.run(run())
+        self.assertEqual(
+            [
+                [Diagnostic("NoSuchMethod", "Square has no method named getZ")],
+                [Diagnostic("JavaTypeError", "Type int is not instantiable")],
+                [Diagnostic("NoSuchVariable", "Cannot find variable p")],
+            ],
+            [result.diagnostics for result in results])
+        self.assertTrue(all(result.static_type is None for result in results))
+
+    def test_uses_scope(self):
+        async def run():
+            async with CheckingService(self.universe) as service:
+                return await service.check(
+                    MethodCall(Variable("s"), "getSides"),
+                    Scope.empty.declare("s", self.square))
+
+        self.assertEqual(Type.int, asyncio.run(run()).static_type)
+
+    def test_malformed_request_does_not_fail_its_batch(self):
+        valid = MethodCall(Variable("s", self.square), "getArea")
+        malformed = ConstructorCall(self.square, "oops")  # Not an Expression
+
+        async def run():
+            async with CheckingService(self.universe, max_batch_delay=0.05) as service:
+                return await asyncio.gather(service.check(valid), service.check(malformed))
+
+        for results in [asyncio.run(run()), check_batch([(valid, Scope.empty), (malformed, Scope.empty)])]:
+            self.assertEqual(Type.double, results[0].static_type)
+            self.assertFalse(results[1].ok)
+            self.assertEqual("InternalError", results[1].diagnostics[0].kind)
+            self.assertIn("AttributeError", results[1].diagnostics[0].message)
+
+    def test_batches_concurrent_requests(self):
+        expressions = [
+            ConstructorCall(self.square, Literal(str(i), Type.double))
+            for i in range(500)]
+
+        async def run():
+            async with CheckingService(self.universe, workers=2, max_batch_size=50, max_pending=100) as service:
+                results = await service.check_all(expressions)
+                return results, service.metrics.summary()
+
+        results, metrics = asyncio.run(run())
+        self.assertTrue(all(result.static_type is self.square for result in results))
+        self.assertEqual(500, metrics["requests"])
+        self.assertLess(metrics["batches"], 500)
+        self.assertGreater(metrics["mean_batch_size"], 1)
+        self.assertLessEqual(metrics["latency_p50"], metrics["latency_max"])
+
+    def test_refuses_requests_when_not_running(self):
+        service = CheckingService(self.universe)
+        expression = MethodCall(Variable("s", self.square), "getArea")
+
+        async def run():
+            with self.assertRaisesRegex(RuntimeError, "CheckingService is not running"):
+                await service.check(expression)
+            async with service:
+                self.assertEqual(Type.double, (await service.check(expression)).static_type)
+            with self.assertRaisesRegex(RuntimeError, "CheckingService is not running"):
+                await asyncio.wait_for(service.check(expression), 1)
+
+        asyncio.run(run())
+
+    def test_freezes_universe(self):
+        async def run():
+            async with CheckingService(self.universe):
+                pass
+
+        asyncio.run(run())
+        self.assertTrue(self.universe.is_frozen)
+        self.assertTrue(self.square.is_frozen)
+
+
+if __name__ == '__main__':
+    unittest.main()
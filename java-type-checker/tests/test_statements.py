@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestScope(unittest.TestCase):
+
+    def test_declare_does_not_modify_original(self):
+        outer = Scope.empty.declare("p", Graphics.point)
+        inner = outer.declare("s", Graphics.size)
+        self.assertEqual(Graphics.size, inner.lookup("s"))
+        self.assertEqual(Graphics.point, inner.lookup("p"))
+        self.assertNotIn("s", outer)
+        self.assertEqual(1, len(outer))
+        self.assertEqual(2, len(inner))
+
+    def test_raises_no_such_variable(self):
+        with self.assertRaisesRegex(NoSuchVariable, "Cannot find variable q"):
+            Scope.empty.declare("p", Graphics.point).lookup("q")
+
+    def test_holds_many_variables(self):
+        scope = Scope.empty
+        for i in range(5000):
+            scope = scope.declare("x" + str(i), Type.int if i % 2 else Type.double)
+        self.assertEqual(5000, len(scope))
+        self.assertEqual(Type.int, scope.lookup("x4321"))
+        self.assertEqual(Type.double, scope.lookup("x4320"))
+        self.assertNotIn("x5000", scope)
+
+
+class TestStatements(TypeTest):
+
+    def test_variables_resolve_from_scope(self):
+        """
+        Equivalent Java:
+
+            {
+                Point p = new Point(0.0, 0.0);
+                p.getX();
+            }
+        """
+        self.assertNoCompileErrors(
+            Block(
+                LocalDeclaration("p", Graphics.point,
+                    ConstructorCall(Graphics.point,
+                        Literal("0.0", Type.double),
+                        Literal("0.0", Type.double))),
+                ExpressionStatement(
+                    MethodCall(Variable("p"), "getX"))))
+
+    def test_flags_undeclared_variable(self):
+        self.assertCompileError(
+            NoSuchVariable,
+            "Cannot find variable p",
+            Block(
+                ExpressionStatement(
+                    MethodCall(Variable("p"), "getX"))))
+
+    def test_static_type_resolves_variables_from_scope(self):
+        call = MethodCall(Variable("p"), "getX")
+        self.assertEqual(Type.double, call.static_type(Scope.empty.declare("p", Graphics.point)))
+        with self.assertRaisesRegex(NoSuchVariable, "Cannot find variable p"):
+            call.static_type()
+
+    def test_flags_incompatible_initializer(self):
+        """
+        Equivalent Java:
+
+            Point p = new Size(0.0, 0.0);
+        """
+        self.assertCompileError(
+            JavaTypeError,
+            "Incompatible types: Size cannot be converted to Point",
+            LocalDeclaration("p", Graphics.point,
+                ConstructorCall(Graphics.size,
+                    Literal("0.0", Type.double),
+                    Literal("0.0", Type.double))))
+
+    def test_allows_subtype_and_null_initializers(self):
+        self.assertNoCompileErrors(
+            Block(
+                LocalDeclaration("paint", Graphics.paint, Variable("red", Graphics.color)),
+                LocalDeclaration("fill", Graphics.paint, NullLiteral()),
+                LocalDeclaration("d", Type.double, Literal("1", Type.int))))
+
+    def test_flags_void_variable(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Variable v cannot have type void",
+            LocalDeclaration("v", Type.void))
+
+    def test_flags_redeclaration_in_nested_block(self):
+        """
+        Equivalent Java:
+
+            {
+                Point p;
+                {
+                    Size p;  // error here
+                }
+            }
+        """
+        self.assertCompileError(
+            JavaTypeError,
+            "Variable p is already defined in this scope",
+            Block(
+                LocalDeclaration("p", Graphics.point),
+                Block(
+                    LocalDeclaration("p", Graphics.size))))
+
+    def test_nested_block_variables_go_out_of_scope(self):
+        """
+        Equivalent Java:
+
+            {
+                {
+                    Point p;
+                }
+                p.getX();  // error here
+            }
+        """
+        self.assertCompileError(
+            NoSuchVariable,
+            "Cannot find variable p",
+            Block(
+                Block(
+                    LocalDeclaration("p", Graphics.point)),
+                ExpressionStatement(
+                    MethodCall(Variable("p"), "getX"))))
+
+    def test_sibling_blocks_may_reuse_names(self):
+        self.assertNoCompileErrors(
+            Block(
+                Block(LocalDeclaration("p", Graphics.point)),
+                Block(LocalDeclaration("p", Graphics.size))))
+
+    def test_checks_long_method_bodies(self):
+        statements = [LocalDeclaration("x0", Type.int, Literal("0", Type.int))]
+        for i in range(1, 3000):
+            statements.append(
+                LocalDeclaration("x" + str(i), Type.int,
+                    BinaryOperation(Variable("x" + str(i - 1)), "+", Literal("1", Type.int))))
+        self.assertNoCompileErrors(Block(*statements))
+
+
+if __name__ == '__main__':
+    unittest.main()
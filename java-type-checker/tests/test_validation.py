@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+
+
+class TestValidation(unittest.TestCase):
+
+    def test_fixture_types_are_valid(self):
+        self.assertEqual([], find_problems(Graphics.all_types))
+        validate_types(Graphics.all_types)
+
+    def test_detects_inheritance_cycle(self):
+        a = ClassOrInterface("A", direct_supertypes=[Type.object])
+        b = ClassOrInterface("B", direct_supertypes=[a])
+        c = ClassOrInterface("C", direct_supertypes=[b])
+        a.direct_supertypes = [c]
+        self.assert_problems(
+            [a, b, c],
+            "Inheritance cycle: ")
+
+    def test_detects_self_inheritance(self):
+        a = ClassOrInterface("A")
+        a.direct_supertypes = [a]
+        self.assert_problems([a], "Inheritance cycle: A → A")
+
+    def test_detects_non_type_references(self):
+        color = ClassOrInterface("Color",
+            direct_supertypes=[Type.object],
+            constructor=Constructor([int, int, int]))
+        self.assert_problems(
+            [color],
+            "Color: constructor argument type <class 'int'> is not a Type")
+
+    def test_detects_dangling_references(self):
+        orphan = ClassOrInterface("Orphan")
+        holder = ClassOrInterface("Holder",
+            methods=[Method("get", return_type=orphan)])
+        self.assert_problems(
+            [holder],
+            "Holder: get() return type Orphan is not in the type universe")
+
+    def test_detects_primitive_supertype(self):
+        weird = ClassOrInterface("Weird", direct_supertypes=[Type.int])
+        self.assert_problems(
+            [weird],
+            "Weird: supertype int is not a class or interface")
+
+    def test_detects_void_arguments(self):
+        weird = ClassOrInterface("Weird",
+            methods=[Method("take", argument_types=[Type.void], return_type=Type.void)])
+        self.assert_problems(
+            [weird],
+            "Weird: take() argument type cannot be void")
+
+    def test_detects_conflicting_override(self):
+        point3d = ClassOrInterface("Point3D",
+            direct_supertypes=[Graphics.point],
+            methods=[Method("getX", return_type=Type.int)])
+        self.assert_problems(
+            Graphics.all_types + [point3d],
+            "Point3D: getX() conflicts with the declaration it overrides in Point")
+
+    def test_allows_covariant_return(self):
+        child = ClassOrInterface("Child",
+            direct_supertypes=[Graphics.fill_colorable],
+            methods=[Method("getFillColor", return_type=Graphics.color)])
+        validate_types(Graphics.all_types + [child])
+
+    def test_detects_conflicting_inherited_declarations(self):
+        positioned = ClassOrInterface("Positioned",
+            direct_supertypes=[Type.object],
+            methods=[Method("getPosition", return_type=Graphics.size)])
+        both = ClassOrInterface("Both",
+            direct_supertypes=[Graphics.graphics_object, positioned])
+        self.assert_problems(
+            Graphics.all_types + [positioned, both],
+            "Both: inherits conflicting declarations of getPosition() from GraphicsObject and Positioned")
+
+    def test_handles_deep_hierarchies(self):
+        types = [Type.object]
+        for i in range(5000):
+            types.append(ClassOrInterface("T" + str(i), direct_supertypes=[types[-1]]))
+        validate_types(types[1:])
+
+    # ––– Helpers –––
+
+    def assert_problems(self, types, expected_problem):
+        with self.assertRaises(InvalidTypeModel) as context:
+            validate_types(types)
+        self.assertTrue(
+            any(problem.startswith(expected_problem) for problem in context.exception.problems),
+            context.exception.problems)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,24 @@
 package plang;
 
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Collections;
-import java.util.HashMap;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
 
 /**
  * The runtime state of an object in Python.
+ *
+ * Attribute values live in a plain array; the object’s Shape says which name is at which index.
+ * Objects that get the same attributes in the same order (e.g. instances of the same class set up
+ * by the same constructor) share one Shape instead of each carrying its own hash map.
  */
 public class PythonObject {
-    private final Map<String,PythonObject> attrs = new HashMap<>();
+    private static final PythonObject[] NO_VALUES = new PythonObject[0];
+
+    private Shape shape = Shape.EMPTY;
+    private PythonObject[] values = NO_VALUES;
     private final PythonType type;
     private List<PythonObject> mro;
 
@@ -33,12 +41,11 @@ public class PythonObject {
      * Return the list of objects we should search when asked for a given attribute, in the order
      * we should search them.
      *
-     * The real Python implementation of the MRO is substantially more complicated, because
-     * (1) Python supports multiple inheritance (i.e. classes can have multiple base classes), and
-     * (2) the base of `type` is `object`, and the type of `object` is `type`, which creates a
-     *     circular reference that Python resolves by special-casing both `object` and `type`.
+     * The real Python implementation of the MRO is more complicated, because the base of `type`
+     * is `object`, and the type of `object` is `type`, which creates a circular reference that
+     * Python resolves by special-casing both `object` and `type`.
      *
-     * Once again, hooray for not having to deal with that.
+     * Hooray for not having to deal with that.
      */
     public List<PythonObject> getMRO() {
         if(mro == null)
@@ -54,10 +61,7 @@ public class PythonObject {
         List<PythonObject> MRO = new ArrayList<>();
         MRO.add(this);
         if(this.getType() != null){
-            MRO.add(this.getType());
-        }
-        if(this.getType().getBase() != null){
-            MRO.add(this.getType().getBase());
+            MRO.addAll(this.getType().getMRO());
         }
         return MRO;
     }
@@ -70,13 +74,20 @@ public class PythonObject {
      * @throws PythonAttributeException When there is no attribute on this object with that name.
      */
     public final PythonObject get(String attrName) throws PythonAttributeException {
-        mro = this.getMRO();
-        for(PythonObject object : mro){
-            if(object.attrs.containsKey(attrName)){
-                return object.attrs.get(attrName);
-            }
+        PythonType.LookupEntry entry = findLookupEntry(attrName);
+        if(entry == null) {
+            int index = shape.indexOf(attrName);
+            if(index < 0)
+                throw new PythonAttributeException(this, attrName);
+            return values[index];
         }
-        throw new PythonAttributeException(this, attrName);
+
+        int index = entry.indexIn(shape, attrName);
+        if(index >= 0)
+            return values[index];
+        if(entry.owner == null)
+            throw new PythonAttributeException(this, attrName);
+        return entry.owner.values[entry.ownerIndex];
     }
 
     /**
@@ -88,11 +99,55 @@ public class PythonObject {
      * @param value Its new value
      */
     public final void set(String attrName, PythonObject value) {
-        attrs.put(attrName, value);
+        int index = shape.indexOf(attrName);
+        if(index >= 0) {
+            values[index] = value;
+            return;
+        }
+
+        index = shape.size();
+        shape = shape.withAttr(attrName);
+        if(index >= values.length)
+            values = Arrays.copyOf(values, Math.max(4, values.length * 2));
+        values[index] = value;
+        attrAdded(attrName);
+    }
+
+    /**
+     * Returns the cached lookup of the given attribute along this object’s type’s MRO, or null if
+     * this object has no type to search.
+     */
+    PythonType.LookupEntry findLookupEntry(String attrName) {
+        return (getType() == null) ? null : getType().lookup(attrName);
+    }
+
+    /**
+     * The layout of this object’s own attributes.
+     */
+    final Shape getShape() {
+        return shape;
+    }
+
+    /**
+     * The index of the given attribute in this object’s own values, ignoring its MRO, or -1 if
+     * this object itself does not have it.
+     */
+    final int ownIndexOf(String attrName) {
+        return shape.indexOf(attrName);
+    }
+
+    /**
+     * Called when set() gives this object an attribute it did not have before. Only types care:
+     * that can change the result of attribute lookups on them, their subtypes, and instances.
+     */
+    void attrAdded(String attrName) {
     }
 
     @Override
     public String toString() {
+        Map<String,PythonObject> attrs = new LinkedHashMap<>();
+        for(String attrName : shape.getNames())
+            attrs.put(attrName, values[shape.indexOf(attrName)]);
         return "PythonObject<" + getType().getName() + ">" + attrs;
     }
 }
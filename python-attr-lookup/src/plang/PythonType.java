@@ -1,28 +1,59 @@
 package plang;
 
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Collections;
+import java.util.HashMap;
 import java.util.List;
+import java.util.Map;
 
 /**
  * A Python class.
  */
 public class PythonType extends PythonObject {
 
+    /**
+     * Bumped whenever any type gains a new attribute, which may change where some attribute
+     * lookup ends up. Each type’s lookup cache remembers the version it was filled at, and throws
+     * its contents away when it is out of date.
+     *
+     * (Real Python keeps a version tag per type and invalidates subclasses individually. A single
+     * global counter is simpler, and types gain new attributes rarely compared to how often they
+     * are read.)
+     */
+    private static int typeVersion = 0;
+
     private final String name;
-    private final PythonObject base;
+    private final List<PythonObject> bases;
+    private final Map<String,LookupEntry> lookupCache = new HashMap<>();
+    private int lookupCacheVersion = -1;
 
     /**
      * Declares a new Python type. Equivalent to Python `class «name»(«base»):`
      * @param name The name of this class.
      * @param base The base class of this class. May be null.
-     *             (In real Python, instead of null it would be the class called `object`, and
-     *             it would be a list instead of a single value.)
+     *             (In real Python, instead of null it would be the class called `object`.)
      */
     public PythonType(String name, PythonObject base) {
+        this(name, base, new PythonObject[0]);
+    }
+
+    /**
+     * Declares a new Python type with multiple inheritance. Equivalent to Python
+     * `class «name»(«base», «moreBases»...):`
+     * @param name The name of this class.
+     * @param base The first base class of this class. May be null if there are no bases at all.
+     * @param moreBases Any further base classes, in the order they are declared.
+     */
+    public PythonType(String name, PythonObject base, PythonObject... moreBases) {
         super(null);  // In real Python, this would be the type called `type`
         this.name = name;
-        this.base = base;
+
+        List<PythonObject> bases = new ArrayList<>();
+        if(base != null)
+            bases.add(base);
+        bases.addAll(Arrays.asList(moreBases));
+        this.bases = Collections.unmodifiableList(bases);
     }
 
     /**
@@ -33,23 +64,132 @@ public class PythonType extends PythonObject {
     }
 
     /**
-     * The base type (superclass) of this class.
+     * The first base type (superclass) of this class, or null if it has none.
      */
     public PythonObject getBase() {
-        return base;
+        return bases.isEmpty() ? null : bases.get(0);
     }
 
+    /**
+     * All the base types of this class, in the order they were declared.
+     */
+    public List<PythonObject> getBases() {
+        return bases;
+    }
+
+    /**
+     * Builds the MRO using C3 linearization, the same algorithm real Python uses: this type comes
+     * first, and the rest merges the MROs of the bases so that every class comes before its own
+     * bases, and bases keep the order they were declared in.
+     *
+     * @throws IllegalStateException If the bases have no consistent order, e.g. `class C(A, B)`
+     *             when B is a subclass of A.
+     */
     @Override
     protected List<PythonObject> buildMRO() {
+        List<List<PythonObject>> sequences = new ArrayList<>();
+        for(PythonObject base : bases)
+            sequences.add(new ArrayList<>(base.getMRO()));
+        sequences.add(new ArrayList<>(bases));
+
         List<PythonObject> MRO = new ArrayList<>();
         MRO.add(this);
-        if(this.getType() != null){
-            MRO.add(this.getType());
+        while(true) {
+            sequences.removeIf(List::isEmpty);
+            if(sequences.isEmpty())
+                return MRO;
+
+            PythonObject next = null;
+            for(List<PythonObject> sequence : sequences) {
+                PythonObject candidate = sequence.get(0);
+                if(!appearsInAnyTail(candidate, sequences)) {
+                    next = candidate;
+                    break;
+                }
+            }
+            if(next == null)
+                throw new IllegalStateException(
+                    "Cannot create a consistent method resolution order (MRO) for " + name);
+
+            MRO.add(next);
+            for(List<PythonObject> sequence : sequences)
+                if(sequence.get(0) == next)
+                    sequence.remove(0);
         }
-        if(this.getBase() != null){
-            MRO.add(this.getBase());
+    }
+
+    private static boolean appearsInAnyTail(PythonObject candidate, List<List<PythonObject>> sequences) {
+        for(List<PythonObject> sequence : sequences)
+            if(sequence.indexOf(candidate) > 0)
+                return true;
+        return false;
+    }
+
+    /**
+     * The result of looking up one attribute name along a type’s MRO, plus an inline cache of
+     * where that name sits in the last object Shape it was looked up on.
+     */
+    static final class LookupEntry {
+        final PythonObject owner;   // The first object in the MRO that has the attribute, or null
+        final int ownerIndex;       // Index of the attribute in the owner’s values
+
+        private Shape cachedShape;
+        private int cachedIndex;
+
+        LookupEntry(PythonObject owner, int ownerIndex) {
+            this.owner = owner;
+            this.ownerIndex = ownerIndex;
+        }
+
+        /**
+         * The index of the attribute in the values of an object with the given shape, or -1 if
+         * such objects do not have it themselves. Skips the shape’s table entirely when called
+         * again with the same shape, which is the common case for instances of one class.
+         */
+        int indexIn(Shape shape, String attrName) {
+            if(shape != cachedShape) {
+                cachedIndex = shape.indexOf(attrName);
+                cachedShape = shape;
+            }
+            return cachedIndex;
+        }
+    }
+
+    /**
+     * Finds which object in this type’s MRO holds the given attribute. Results, including misses,
+     * are cached until some type gains a new attribute, so repeated lookups cost a single hash
+     * lookup no matter how deep the hierarchy is. (The owner’s index stays valid for as long as
+     * the entry does, because objects only ever gain attributes, and existing ones never move.)
+     */
+    LookupEntry lookup(String attrName) {
+        if(lookupCacheVersion != typeVersion) {
+            lookupCache.clear();
+            lookupCacheVersion = typeVersion;
         }
-        return MRO;
+
+        LookupEntry entry = lookupCache.get(attrName);
+        if(entry == null) {
+            entry = new LookupEntry(null, -1);
+            for(PythonObject object : getMRO()) {
+                int index = object.ownIndexOf(attrName);
+                if(index >= 0) {
+                    entry = new LookupEntry(object, index);
+                    break;
+                }
+            }
+            lookupCache.put(attrName, entry);
+        }
+        return entry;
+    }
+
+    @Override
+    LookupEntry findLookupEntry(String attrName) {
+        return lookup(attrName);
+    }
+
+    @Override
+    void attrAdded(String attrName) {
+        typeVersion++;
     }
 
     /**
@@ -0,0 +1,104 @@
+package plang;
+
+import java.util.Arrays;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * The layout of an object’s attributes: which attribute names it has, and at which index of the
+ * object’s value array each one lives. (Also known as a “hidden class.”)
+ *
+ * Objects that gained the same attributes in the same order share the same Shape, so the name →
+ * index table is stored once rather than once per object. Shapes never change: adding an
+ * attribute moves the object to a different Shape, found by following a transition from its
+ * current one. Because the same Shape always puts a given name at the same index, lookups can
+ * cache that index and reuse it as long as they see the same Shape again.
+ *
+ * Each shape only records its parent and the one attribute it adds. The name → index table is
+ * shared along a chain of transitions: a shape reuses its parent’s table when it is the parent’s
+ * first transition, and only copies it when it branches off from a parent that already has one.
+ * Building an object attribute by attribute therefore costs time and memory proportional to its
+ * number of attributes, not to the square of it.
+ */
+final class Shape {
+    /**
+     * The shape of an object with no attributes. Every other shape is reachable from it.
+     */
+    static final Shape EMPTY = new Shape(null, null, new HashMap<String,Integer>());
+
+    private final Shape parent;
+    private final String attrName;
+    private final int size;
+    private final Map<String,Integer> indices;  // May also hold later shapes’ entries; see indexOf()
+    private final Map<String,Shape> transitions = new HashMap<>();
+
+    private Shape(Shape parent, String attrName, Map<String,Integer> indices) {
+        this.parent = parent;
+        this.attrName = attrName;
+        this.size = (parent == null) ? 0 : parent.size + 1;
+        this.indices = indices;
+    }
+
+    /**
+     * The index of the given attribute’s value, or -1 if objects of this shape do not have it.
+     */
+    int indexOf(String attrName) {
+        // The table may be shared with shapes further along the chain. Their entries have indices
+        // at or beyond this shape’s size, and are not attributes of this shape.
+        Integer index = indices.get(attrName);
+        return (index == null || index >= size) ? -1 : index;
+    }
+
+    /**
+     * The number of attributes objects of this shape have.
+     */
+    int size() {
+        return size;
+    }
+
+    /**
+     * The attribute names of this shape, in index order. Takes time proportional to the number of
+     * attributes; use indexOf() for lookups.
+     */
+    List<String> getNames() {
+        String[] names = new String[size];
+        for(Shape shape = this; shape.parent != null; shape = shape.parent)
+            names[shape.size - 1] = shape.attrName;
+        return Collections.unmodifiableList(Arrays.asList(names));
+    }
+
+    /**
+     * Returns the shape of an object that has this shape’s attributes and then gains the given new
+     * one. Objects adding the same attribute to the same shape all end up sharing the result.
+     */
+    Shape withAttr(String attrName) {
+        Shape next = transitions.get(attrName);
+        if(next == null) {
+            if(indexOf(attrName) >= 0)
+                throw new IllegalArgumentException("Shape already has attribute " + attrName);
+
+            Map<String,Integer> nextIndices;
+            if(transitions.isEmpty())
+                nextIndices = indices;  // First transition: extend the shared table
+            else
+                nextIndices = ownIndices();  // Branch: the shared table belongs to another chain
+            nextIndices.put(attrName, size);
+
+            next = new Shape(this, attrName, nextIndices);
+            transitions.put(attrName, next);
+        }
+        return next;
+    }
+
+    /**
+     * A new table holding just this shape’s own entries.
+     */
+    private Map<String,Integer> ownIndices() {
+        Map<String,Integer> copy = new HashMap<>();
+        for(Shape shape = this; shape.parent != null; shape = shape.parent)
+            copy.put(shape.attrName, shape.size - 1);
+        return copy;
+    }
+}
@@ -0,0 +1,110 @@
+package plang;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.Arrays;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class PythonTypeTest {
+
+    // –––––– C3 linearization tests ––––––
+
+    @Test
+    void mroOfDiamondFollowsC3() throws Exception {
+        // Equivalent Python:
+        //
+        //   class A: pass
+        //   class B(A): pass
+        //   class C(A): pass
+        //   class D(B, C): pass
+
+        PythonType a = new PythonType("A", null);
+        PythonType b = new PythonType("B", a);
+        PythonType c = new PythonType("C", a);
+        PythonType d = new PythonType("D", b, c);
+
+        assertEquals(Arrays.asList(d, b, c, a), d.getMRO());
+
+        PythonObject obj = d.instantiate();
+        assertEquals(Arrays.asList(obj, d, b, c, a), obj.getMRO());
+    }
+
+    @Test
+    void mroKeepsLocalPrecedenceOrder() throws Exception {
+        // The classic example from the C3 paper:
+        //
+        //   class O: pass
+        //   class F(O): pass
+        //   class E(O): pass
+        //   class D(O): pass
+        //   class C(D, F): pass
+        //   class B(D, E): pass
+        //   class A(B, C): pass
+
+        PythonType o = new PythonType("O", null);
+        PythonType f = new PythonType("F", o);
+        PythonType e = new PythonType("E", o);
+        PythonType d = new PythonType("D", o);
+        PythonType c = new PythonType("C", d, f);
+        PythonType b = new PythonType("B", d, e);
+        PythonType a = new PythonType("A", b, c);
+
+        assertEquals(Arrays.asList(a, b, c, d, e, f, o), a.getMRO());
+    }
+
+    @Test
+    void inconsistentBasesAreRejected() throws Exception {
+        // Equivalent Python:
+        //
+        //   class A: pass
+        //   class B(A): pass
+        //   class C(A, B): pass   # TypeError: Cannot create a consistent MRO
+
+        PythonType a = new PythonType("A", null);
+        PythonType b = new PythonType("B", a);
+        PythonType c = new PythonType("C", a, b);
+
+        assertThrows(IllegalStateException.class, c::getMRO);
+    }
+
+    // –––––– Lookup cache tests ––––––
+
+    @Test
+    void findsAttrsThroughSecondBase() throws Exception {
+        PythonType a = new PythonType("A", null);
+        PythonType b = new PythonType("B", null);
+        PythonType c = new PythonType("C", a, b);
+        b.set("greeting", new PythonString("hello"));
+
+        assertEquals("hello", c.instantiate().get("greeting").toString());
+    }
+
+    @Test
+    void cachedLookupsSeeLaterChanges() throws Exception {
+        PythonType base = new PythonType("Base", null);
+        PythonType middle = new PythonType("Middle", base);
+        PythonType leaf = new PythonType("Leaf", middle);
+        PythonObject obj = leaf.instantiate();
+
+        base.set("socks", new PythonString("rainbow"));
+        assertEquals("rainbow", obj.get("socks").toString());
+
+        middle.set("socks", new PythonString("argyle"));   // New attribute: lookup must move
+        assertEquals("argyle", obj.get("socks").toString());
+
+        middle.set("socks", new PythonString("plaid"));    // Same owner, new value
+        assertEquals("plaid", obj.get("socks").toString());
+    }
+
+    @Test
+    void cachedMissesSeeLaterChanges() throws Exception {
+        PythonType base = new PythonType("Base", null);
+        PythonType leaf = new PythonType("Leaf", base);
+        PythonObject obj = leaf.instantiate();
+
+        assertThrows(PythonAttributeException.class, () -> obj.get("hat"));
+        base.set("hat", new PythonString("fedora"));
+        assertEquals("fedora", obj.get("hat").toString());
+    }
+}
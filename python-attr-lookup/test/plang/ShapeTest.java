@@ -0,0 +1,113 @@
+package plang;
+
+import org.junit.jupiter.api.BeforeEach;
+import org.junit.jupiter.api.Test;
+
+import java.util.Arrays;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class ShapeTest {
+
+    private PythonType pointType;
+
+    @BeforeEach
+    void createTestType() {
+        pointType = new PythonType("Point", null);
+    }
+
+    @Test
+    void instancesWithSameAttrsShareShape() throws Exception {
+        PythonObject p0 = pointType.instantiate();
+        PythonObject p1 = pointType.instantiate();
+        assertSame(p0.getShape(), p1.getShape());
+
+        p0.set("x", new PythonString("1"));
+        p0.set("y", new PythonString("2"));
+        p1.set("x", new PythonString("3"));
+        p1.set("y", new PythonString("4"));
+
+        assertSame(p0.getShape(), p1.getShape());
+        assertEquals(Arrays.asList("x", "y"), p0.getShape().getNames());
+        assertEquals("2", p0.get("y").toString());
+        assertEquals("4", p1.get("y").toString());
+    }
+
+    @Test
+    void attrOrderDeterminesShape() throws Exception {
+        PythonObject p0 = pointType.instantiate();
+        PythonObject p1 = pointType.instantiate();
+        p0.set("x", null);
+        p0.set("y", null);
+        p1.set("y", null);
+        p1.set("x", null);
+
+        assertNotSame(p0.getShape(), p1.getShape());
+    }
+
+    @Test
+    void changingExistingAttrKeepsShape() throws Exception {
+        PythonObject p = pointType.instantiate();
+        p.set("x", new PythonString("1"));
+        Shape shape = p.getShape();
+
+        p.set("x", new PythonString("5"));
+        assertSame(shape, p.getShape());
+        assertEquals("5", p.get("x").toString());
+    }
+
+    @Test
+    void holdsManyAttrs() throws Exception {
+        PythonObject obj = pointType.instantiate();
+        for(int i = 0; i < 100; i++)
+            obj.set("attr" + i, new PythonString("value" + i));
+
+        assertEquals(100, obj.getShape().size());
+        for(int i = 0; i < 100; i++)
+            assertEquals("value" + i, obj.get("attr" + i).toString());
+    }
+
+    @Test
+    void branchingShapesKeepTheirOwnAttrs() throws Exception {
+        PythonObject p0 = pointType.instantiate();
+        PythonObject p1 = pointType.instantiate();
+        PythonObject p2 = pointType.instantiate();
+        p0.set("x", new PythonString("x0"));
+        p0.set("y", new PythonString("y0"));
+        p1.set("x", new PythonString("x1"));
+        p1.set("z", new PythonString("z1"));
+        p2.set("x", new PythonString("x2"));
+
+        assertEquals(Arrays.asList("x", "y"), p0.getShape().getNames());
+        assertEquals(Arrays.asList("x", "z"), p1.getShape().getNames());
+        assertEquals(Arrays.asList("x"), p2.getShape().getNames());
+        assertEquals(-1, p0.getShape().indexOf("z"));
+        assertEquals(-1, p1.getShape().indexOf("y"));
+        assertEquals(-1, p2.getShape().indexOf("y"));
+        assertEquals(-1, p2.getShape().indexOf("z"));
+        assertEquals(1, p1.getShape().indexOf("z"));
+        assertEquals("z1", p1.get("z").toString());
+        assertEquals("y0", p0.get("y").toString());
+    }
+
+    @Test
+    void lookupsSeeInstancesOfDifferentShapes() throws Exception {
+        pointType.set("x", new PythonString("default"));
+        PythonObject plain = pointType.instantiate();
+        PythonObject custom = pointType.instantiate();
+        custom.set("x", new PythonString("custom"));
+
+        for(int i = 0; i < 3; i++) {
+            assertEquals("default", plain.get("x").toString());
+            assertEquals("custom", custom.get("x").toString());
+        }
+    }
+
+    @Test
+    void toStringListsAttrsInOrder() throws Exception {
+        PythonObject p = pointType.instantiate();
+        p.set("x", new PythonString("1"));
+        p.set("y", new PythonString("2"));
+        assertEquals("PythonObject<Point>{x=1, y=2}", p.toString());
+    }
+}